@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from database import SessionLocal, User as DBUser, Account as DBAccount, Transaction as DBTransaction
+from services import RollupService
 from datetime import datetime, timedelta
 import random
 
@@ -95,6 +96,7 @@ def add_demo_transactions():
             transactions_created += 1
     
     db.commit()
+    RollupService.rebuild(db, user.id)
     print(f"Successfully created {transactions_created} demo transactions!")
     print(f"Total transactions in database: {db.query(DBTransaction).filter(DBTransaction.user_id == user.id).count()}")
     print("\nNow you can see the Analytics charts with real data!")
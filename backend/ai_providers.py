@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import os
+import re
+from abc import ABC, abstractmethod
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# AI provider configuration
+# AI_PROVIDER: "auto" (OpenAI when a key is configured, otherwise rules), "openai", "local" or "rules"
+AI_PROVIDER = os.getenv("AI_PROVIDER", "auto").lower()
+AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", "15"))
+AI_CACHE_TTL_SECONDS = float(os.getenv("AI_CACHE_TTL_SECONDS", "600"))
+AI_CACHE_SIZE = int(os.getenv("AI_CACHE_SIZE", "1024"))
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+# Simulated latency of the local stub, to load-test the pipeline offline
+AI_STUB_LATENCY_MS = float(os.getenv("AI_STUB_LATENCY_MS", "0"))
+
+class AdviceProvider(ABC):
+    # Interface for the language-model backends behind AIAssistantService
+    name = "base"
+    confidence = 0.95
+
+    @abstractmethod
+    async def complete(self, system_prompt: str, user_prompt: str) -> str:
+        ...
+
+    async def stream(self, system_prompt: str, user_prompt: str):
+        # Yields the completion in chunks; providers without native streaming yield it whole
+        yield await self.complete(system_prompt, user_prompt)
+
+def split_chunks(text: str) -> list:
+    # Word-sized chunks (trailing whitespace kept) for streaming text that is already complete
+    return re.findall(r"\S+\s*", text)
+
+class OpenAIProvider(AdviceProvider):
+    name = "openai"
+    confidence = 0.95
+
+    def __init__(self, api_key: str, model: str = OPENAI_MODEL):
+        from openai import AsyncOpenAI
+
+        # One client per process so its HTTP connection pool is reused across requests
+        self.client = AsyncOpenAI(api_key=api_key, timeout=AI_TIMEOUT_SECONDS, max_retries=0)
+        self.model = model
+
+    async def complete(self, system_prompt: str, user_prompt: str) -> str:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=400,
+            temperature=0.7
+        )
+        return response.choices[0].message.content
+
+    async def stream(self, system_prompt: str, user_prompt: str):
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=400,
+            temperature=0.7,
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+class LocalStubProvider(AdviceProvider):
+    # Deterministic offline stand-in: the same prompt always produces the same answer
+    name = "local"
+    confidence = 0.5
+
+    async def complete(self, system_prompt: str, user_prompt: str) -> str:
+        if AI_STUB_LATENCY_MS > 0:
+            await asyncio.sleep(AI_STUB_LATENCY_MS / 1000)
+        return self.answer(system_prompt, user_prompt)
+
+    async def stream(self, system_prompt: str, user_prompt: str):
+        # The simulated latency is spread across the chunks, like a model generating tokens
+        chunks = split_chunks(self.answer(system_prompt, user_prompt))
+        for chunk in chunks:
+            if AI_STUB_LATENCY_MS > 0:
+                await asyncio.sleep(AI_STUB_LATENCY_MS / 1000 / len(chunks))
+            yield chunk
+
+    def answer(self, system_prompt: str, user_prompt: str) -> str:
+        digest = hashlib.sha256(f"{system_prompt}\n{user_prompt}".encode()).hexdigest()[:8]
+        facts = [line.strip("- ").strip() for line in user_prompt.splitlines() if line.startswith("- ")]
+        summary = "; ".join(facts[:4]) if facts else "no financial data available"
+        return (
+            f"[local advisor {digest}] Based on your data ({summary}), keep tracking your spending, "
+            "build an emergency fund of 3-6 months of expenses and direct any surplus to your goals."
+        )
+
+_provider = None
+_provider_loaded = False
+
+def get_provider():
+    # Returns the configured provider, or None when only the rule-based engine should be used
+    global _provider, _provider_loaded
+    if _provider_loaded:
+        return _provider
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    has_key = bool(api_key) and api_key != "your-openai-api-key-here"
+    if AI_PROVIDER == "local":
+        _provider = LocalStubProvider()
+    elif AI_PROVIDER == "openai" or (AI_PROVIDER == "auto" and has_key):
+        _provider = OpenAIProvider(api_key) if has_key else None
+    else:
+        _provider = None
+    _provider_loaded = True
+    return _provider
+
+def set_provider(provider):
+    # Overrides the configured provider (e.g. the local stub for load tests)
+    global _provider, _provider_loaded
+    _provider = provider
+    _provider_loaded = True
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, type_coerce, BigInteger
+from sqlalchemy.orm import Session
+
+from database import Transaction as DBTransaction
+
+# Columnar analytics over a user's transactions. Only the four columns the calculations need
+# are loaded, straight into NumPy arrays, and every aggregate is computed vectorized with
+# pandas groupby / NumPy reductions instead of per-row Python loops. Amounts stay in the stored
+# integer cents (int64) through every sum and are converted to dollars only in the results.
+FRAME_COLUMNS = ["transaction_date", "transaction_type", "category", "amount"]
+
+PERCENTILES = (50, 75, 90, 95)
+
+def month_start(year: int, month: int) -> datetime:
+    # Normalizes out-of-range months, e.g. month 13 -> January of the next year
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1)
+
+def load_frame(db: Session, user_id: int, start_date: datetime, end_date: datetime,
+               transaction_type: Optional[str] = None) -> pd.DataFrame:
+    # Transactions in [start_date, end_date) as a DataFrame with one array per column
+    query = select(
+        DBTransaction.transaction_date,
+        DBTransaction.transaction_type,
+        DBTransaction.category,
+        type_coerce(DBTransaction.amount, BigInteger)
+    ).where(
+        DBTransaction.user_id == user_id,
+        DBTransaction.transaction_date >= start_date,
+        DBTransaction.transaction_date < end_date
+    )
+    if transaction_type:
+        query = query.where(DBTransaction.transaction_type == transaction_type)
+    rows = db.execute(query).all()
+    if not rows:
+        return pd.DataFrame({
+            "transaction_date": pd.Series(dtype="datetime64[ns]"),
+            "transaction_type": pd.Series(dtype=object),
+            "category": pd.Series(dtype=object),
+            "amount": pd.Series(dtype="int64"),
+        })
+    dates, types, categories, amounts = zip(*rows)
+    return pd.DataFrame({
+        "transaction_date": pd.to_datetime(np.array(dates, dtype="datetime64[us]")),
+        "transaction_type": np.array(types, dtype=object),
+        "category": np.array([category or "" for category in categories], dtype=object),
+        "amount": np.array(amounts, dtype="int64"),
+    })
+
+def rounded(values) -> list:
+    return np.round(np.asarray(values, dtype="float64"), 2).tolist()
+
+def dollars(cents) -> np.ndarray:
+    return np.asarray(cents, dtype="float64") / 100
+
+def monthly_trends(db: Session, user_id: int, end_year: int, end_month: int, months: int = 12, window: int = 3) -> dict:
+    # Month-by-month series for the `months` months ending with end_year/end_month
+    start = month_start(end_year, end_month - months + 1)
+    end = month_start(end_year, end_month + 1)
+    frame = load_frame(db, user_id, start, end)
+
+    periods = pd.period_range(start=start, periods=months, freq="M")
+    frame["period"] = frame["transaction_date"].dt.to_period("M")
+    by_month = frame.pivot_table(
+        index="period", columns="transaction_type", values="amount", aggfunc="sum", fill_value=0
+    ).reindex(periods, fill_value=0)
+    income_cents = by_month["income"].to_numpy(dtype="int64") if "income" in by_month else np.zeros(months, dtype="int64")
+    expense_cents = by_month["expense"].to_numpy(dtype="int64") if "expense" in by_month else np.zeros(months, dtype="int64")
+    income, expenses = dollars(income_cents), dollars(expense_cents)
+    net = dollars(income_cents - expense_cents)
+    savings_rate = np.divide(net * 100, income, out=np.zeros(months), where=income > 0)
+
+    expense_rows = frame[frame["transaction_type"] == "expense"]
+    largest = dollars(expense_rows.groupby("period")["amount"].max().reindex(periods, fill_value=0).to_numpy())
+    days_in_month = periods.days_in_month.to_numpy()
+    if expense_rows.empty:
+        percentiles = np.zeros(len(PERCENTILES))
+    else:
+        percentiles = dollars(np.percentile(expense_rows["amount"].to_numpy(), PERCENTILES))
+
+    return {
+        "months": [str(period) for period in periods],
+        "income": rounded(income),
+        "expenses": rounded(expenses),
+        "net": rounded(net),
+        "savings_rate": rounded(savings_rate),
+        "rolling_income": rounded(pd.Series(income).rolling(window, min_periods=1).mean()),
+        "rolling_expenses": rounded(pd.Series(expenses).rolling(window, min_periods=1).mean()),
+        "daily_average_expenses": rounded(expenses / days_in_month),
+        "largest_expense": rounded(largest),
+        "expense_percentiles": dict(zip((f"p{p}" for p in PERCENTILES), rounded(percentiles))),
+    }
+
+def category_breakdown(db: Session, user_id: int, start_date: datetime, end_date: datetime,
+                       transaction_type: str = "expense") -> dict:
+    # Per-category totals, counts, shares and amount distribution, largest total first
+    frame = load_frame(db, user_id, start_date, end_date, transaction_type)
+    grouped = frame.groupby("category")["amount"]
+    stats = pd.DataFrame({
+        "total": grouped.sum(),
+        "count": grouped.count(),
+        "median": grouped.median(),
+        "p90": grouped.quantile(0.9),
+    }).sort_values("total", ascending=False)
+    grand_total = int(stats["total"].sum())
+    shares = stats["total"].to_numpy() * 100 / grand_total if grand_total else np.zeros(len(stats))
+
+    return {
+        "transaction_type": transaction_type,
+        "start_date": start_date,
+        "end_date": end_date,
+        "categories": [category or "Uncategorized" for category in stats.index],
+        "totals": rounded(dollars(stats["total"])),
+        "counts": stats["count"].astype(int).tolist(),
+        "shares": rounded(shares),
+        "median": rounded(dollars(stats["median"])),
+        "p90": rounded(dollars(stats["p90"])),
+    }
@@ -0,0 +1,126 @@
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+
+from database import get_async_db
+from models import Account, Transaction, TransactionPage, TransactionType, FinancialGoal, FinancialOverview, \
+    FinancialHealth, AIQuery, AIResponse, User
+from auth import get_current_active_user, get_async_read_db
+from services import SSE_HEADERS, FinancialAnalyticsService
+from http_cache import etag_matches, not_modified, json_response, set_etag, user_etag, query_variant
+from async_services import AsyncAccountService, AsyncTransactionService, AsyncFinancialGoalService, \
+    AsyncFinancialAnalyticsService, AsyncFinancialHealthService, AsyncAIAssistantService
+
+# Async versions of the I/O-bound read endpoints. main.py registers this router ahead of its
+# own routes when ASYNC_DB is enabled, so these take precedence over the sync handlers.
+router = APIRouter()
+
+@router.get("/api/accounts", response_model=List[Account])
+async def get_accounts(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # The version lookup is a blocking query on the primary, so it runs off the event loop
+    etag = await run_in_threadpool(user_etag, "accounts", current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return await AsyncAccountService.get_user_accounts(db, current_user.id)
+
+@router.get("/api/transactions", response_model=List[Transaction])
+async def get_transactions(
+    request: Request,
+    response: Response,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    account_id: Optional[int] = None,
+    category: Optional[str] = None,
+    transaction_type: Optional[TransactionType] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    etag = await run_in_threadpool(user_etag, "transactions", current_user.id, query_variant(request))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    transactions, next_cursor = await AsyncTransactionService.get_transactions_page(
+        db, current_user.id, max(1, min(limit, 500)), cursor,
+        account_id=account_id, category=category, transaction_type=transaction_type,
+        start_date=start_date, end_date=end_date
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return transactions
+
+@router.get("/api/transactions/compact", response_model=TransactionPage)
+async def get_compact_transactions(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    account_id: Optional[int] = None,
+    category: Optional[str] = None,
+    transaction_type: Optional[TransactionType] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return await AsyncTransactionService.get_compact_transactions_page(
+        db, current_user.id, max(1, min(limit, 500)), cursor,
+        account_id=account_id, category=category, transaction_type=transaction_type,
+        start_date=start_date, end_date=end_date
+    )
+
+@router.get("/api/goals", response_model=List[FinancialGoal])
+async def get_goals(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    etag = await run_in_threadpool(user_etag, "goals", current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return await AsyncFinancialGoalService.get_user_goals(db, current_user.id)
+
+@router.get("/api/analytics/overview", response_model=FinancialOverview)
+async def get_financial_overview(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    etag = await run_in_threadpool(FinancialAnalyticsService.overview_etag, current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return json_response(await AsyncFinancialAnalyticsService.get_overview_json(db, current_user.id, etag), etag)
+
+@router.get("/api/analytics/health", response_model=FinancialHealth)
+async def get_financial_health(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return await AsyncFinancialHealthService.get_health(db, current_user.id)
+
+@router.post("/api/ai/advice", response_model=AIResponse)
+async def get_financial_advice(
+    query: AIQuery,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return await AsyncAIAssistantService.get_financial_advice(db, current_user.id, query.query)
+
+@router.post("/api/ai/advice/stream")
+async def stream_financial_advice(
+    query: AIQuery,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    events = await AsyncAIAssistantService.get_advice_stream(db, current_user.id, query.query)
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
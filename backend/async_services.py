@@ -0,0 +1,101 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from models import FinancialOverview, FinancialSnapshot, FinancialHealth, AIResponse
+from services import AccountService, TransactionService, RollupService, FinancialGoalService, \
+    FinancialAnalyticsService, FinancialHealthService, AIAssistantService
+
+# AsyncSession variants of the read paths in services.py. They execute the same statements
+# (built by the *_query helpers) and reuse the same pure functions to shape the results.
+
+class AsyncAccountService:
+    @staticmethod
+    async def get_user_accounts(db: AsyncSession, user_id: int):
+        return (await db.scalars(AccountService.user_accounts_query(user_id))).all()
+
+class AsyncTransactionService:
+    @staticmethod
+    async def get_user_transactions(db: AsyncSession, user_id: int, limit: int = 50):
+        return (await db.scalars(TransactionService.recent_transactions_query(user_id, limit))).all()
+
+    @staticmethod
+    async def get_transactions_page(db: AsyncSession, user_id: int, limit: int = 50, cursor: Optional[str] = None, **filters):
+        rows = (await db.scalars(TransactionService.page_query(user_id, limit, cursor, **filters))).all()
+        return TransactionService._split_page(rows, limit)
+
+    @staticmethod
+    async def get_compact_transactions_page(db: AsyncSession, user_id: int, limit: int = 50, cursor: Optional[str] = None, **filters):
+        rows = (await db.execute(TransactionService.compact_page_query(user_id, limit, cursor, **filters))).all()
+        rows, next_cursor = TransactionService._split_page(rows, limit)
+        account_ids = {row.account_id for row in rows}
+        account_rows = []
+        if account_ids:
+            account_rows = (await db.execute(TransactionService.compact_accounts_query(user_id, account_ids))).all()
+        return TransactionService.build_compact_page(rows, account_rows, next_cursor)
+
+class AsyncFinancialGoalService:
+    @staticmethod
+    async def get_user_goals(db: AsyncSession, user_id: int):
+        return (await db.scalars(FinancialGoalService.user_goals_query(user_id))).all()
+
+class AsyncFinancialAnalyticsService:
+    @staticmethod
+    async def calculate_monthly_metrics(db: AsyncSession, user_id: int, month: int, year: int):
+        rows = (await db.execute(RollupService.month_query(user_id, year, month))).all()
+        return FinancialAnalyticsService.summarize_metrics(rows)
+
+    @staticmethod
+    async def get_financial_overview(db: AsyncSession, user_id: int) -> FinancialOverview:
+        current_date = FinancialAnalyticsService.now()
+        accounts = await AsyncAccountService.get_user_accounts(db, user_id)
+        current_metrics = await AsyncFinancialAnalyticsService.calculate_monthly_metrics(
+            db, user_id, current_date.month, current_date.year
+        )
+        recent_transactions = await AsyncTransactionService.get_user_transactions(db, user_id, 10)
+        active_goals = await AsyncFinancialGoalService.get_user_goals(db, user_id)
+        return FinancialAnalyticsService.build_overview(accounts, current_metrics, recent_transactions, active_goals)
+
+    @staticmethod
+    async def get_overview_json(db: AsyncSession, user_id: int, etag: str) -> bytes:
+        body = FinancialAnalyticsService.get_cached_overview(user_id, etag)
+        if body is None:
+            overview = await AsyncFinancialAnalyticsService.get_financial_overview(db, user_id)
+            body = FinancialAnalyticsService.store_overview(user_id, etag, overview)
+        return body
+
+    @staticmethod
+    async def get_financial_snapshot(db: AsyncSession, user_id: int) -> FinancialSnapshot:
+        current_date = FinancialAnalyticsService.now()
+        balances = (await db.execute(AccountService.balance_summary_query(user_id))).one()
+        current_metrics = await AsyncFinancialAnalyticsService.calculate_monthly_metrics(
+            db, user_id, current_date.month, current_date.year
+        )
+        active_goals = await AsyncFinancialGoalService.get_user_goals(db, user_id)
+        return FinancialAnalyticsService.build_snapshot(balances, current_metrics, active_goals)
+
+class AsyncFinancialHealthService:
+    # Same cache as FinancialHealthService; only a miss loads the snapshot, through the async session
+    @staticmethod
+    async def get_entry(db: AsyncSession, user_id: int):
+        # The key includes the data version, a blocking lookup on the primary
+        key = await run_in_threadpool(FinancialHealthService.cache_key, user_id)
+        entry = FinancialHealthService.cache.get(key)
+        if entry is None:
+            snapshot = await AsyncFinancialAnalyticsService.get_financial_snapshot(db, user_id)
+            entry = FinancialHealthService.store(key, snapshot)
+        return entry
+
+    @staticmethod
+    async def get_health(db: AsyncSession, user_id: int) -> FinancialHealth:
+        return (await AsyncFinancialHealthService.get_entry(db, user_id))[1]
+
+class AsyncAIAssistantService:
+    @staticmethod
+    async def get_financial_advice(db: AsyncSession, user_id: int, query: str) -> AIResponse:
+        snapshot = (await AsyncFinancialHealthService.get_entry(db, user_id))[0]
+        return await AIAssistantService.advise(snapshot, query)
+
+    @staticmethod
+    async def get_advice_stream(db: AsyncSession, user_id: int, query: str):
+        snapshot = (await AsyncFinancialHealthService.get_entry(db, user_id))[0]
+        return AIAssistantService.stream_advice(snapshot, query)
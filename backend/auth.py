@@ -4,8 +4,15 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from starlette.concurrency import run_in_threadpool
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from database import get_db, User as DBUser
+from dataclasses import dataclass
+from database import get_db, read_session, async_read_session, User as DBUser
+from cache import TTLCache
+import asyncio
+import threading
 import os
 from dotenv import load_dotenv
 
@@ -16,18 +23,98 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Authenticated users are cached per process; a deactivation is seen by other workers within the TTL
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+
+# bcrypt work factor. Hashes with a different cost are rehashed on the next successful login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Maximum number of bcrypt operations running at once; further requests wait in the queue
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+@dataclass(frozen=True)
+class CachedUser:
+    # Detached snapshot of the user row, safe to share across requests and sessions
+    id: int
+    email: str
+    full_name: str
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_db(cls, user: DBUser):
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            created_at=user.created_at
+        )
+
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+def invalidate_cached_user(user_id: int):
+    user_cache.delete(user_id)
+
+# Any ORM update or delete of a user (deactivation, profile change) drops the cached snapshot
+@event.listens_for(DBUser, "after_update")
+@event.listens_for(DBUser, "after_delete")
+def _invalidate_user_on_change(mapper, connection, target):
+    invalidate_cached_user(target.id)
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# bcrypt runs in a dedicated bounded pool so login bursts neither block the event loop
+# nor take over the threadpool that serves the other endpoints
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_CONCURRENCY, thread_name_prefix="password-hash")
+_password_tasks_lock = threading.Lock()
+_password_tasks = 0
+
+async def _run_password_task(func, *args):
+    global _password_tasks
+    with _password_tasks_lock:
+        _password_tasks += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+    finally:
+        with _password_tasks_lock:
+            _password_tasks -= 1
+
+def password_hash_stats():
+    with _password_tasks_lock:
+        in_flight = _password_tasks
+    return {
+        "concurrency": PASSWORD_HASH_CONCURRENCY,
+        "in_flight": in_flight,
+        "queue_depth": max(0, in_flight - PASSWORD_HASH_CONCURRENCY)
+    }
+
+async def verify_password_async(plain_password, hashed_password):
+    # Returns (verified, new_hash); new_hash is set when the stored hash uses another work factor
+    return await _run_password_task(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await _run_password_task(pwd_context.hash, password)
+
 def get_user(db: Session, email: str):
     return db.query(DBUser).filter(DBUser.email == email).first()
 
+def get_user_by_id(db: Session, user_id: int):
+    return db.get(DBUser, user_id)
+
 def authenticate_user(db: Session, email: str, password: str):
     user = get_user(db, email)
     if not user:
@@ -36,6 +123,22 @@ def authenticate_user(db: Session, email: str, password: str):
         return False
     return user
 
+def _save_rehashed_password(db: Session, user: DBUser, new_hash: str):
+    user.hashed_password = new_hash
+    db.commit()
+    db.refresh(user)
+
+async def authenticate_user_async(db: Session, email: str, password: str):
+    user = await run_in_threadpool(get_user, db, email)
+    if not user:
+        return False
+    verified, new_hash = await verify_password_async(password, user.hashed_password)
+    if not verified:
+        return False
+    if new_hash:
+        await run_in_threadpool(_save_rehashed_password, db, user, new_hash)
+    return user
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -55,16 +158,43 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
+        user_id = payload.get("uid")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = get_user(db, email=email)
-    if user is None:
+
+    if user_id is not None:
+        cached = user_cache.get(user_id)
+        if cached is not None and cached.email == email:
+            return cached
+        # Cache miss: the sync session's query runs off the event loop
+        user = await run_in_threadpool(get_user_by_id, db, user_id)
+    else:
+        # Tokens issued before the uid claim was added
+        user = await run_in_threadpool(get_user, db, email)
+    if user is None or user.email != email:
         raise credentials_exception
-    return user
 
-async def get_current_active_user(current_user: DBUser = Depends(get_current_user)):
+    cached = CachedUser.from_db(user)
+    user_cache.set(user.id, cached)
+    return cached
+
+async def get_current_active_user(current_user: CachedUser = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+# Sessions for read-only endpoints: the read replica when configured, unless the current user
+# wrote recently (read-your-writes); see READ_DATABASE_URL in database.py
+def get_read_db(current_user: CachedUser = Depends(get_current_active_user)):
+    db = read_session(current_user.id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(current_user: CachedUser = Depends(get_current_active_user)):
+    # Choosing the session may look up the user's last write on the primary (blocking)
+    async with await run_in_threadpool(async_read_session, current_user.id) as db:
+        yield db
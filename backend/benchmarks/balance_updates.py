@@ -0,0 +1,134 @@
+# Concurrent stress test for account balance updates.
+# Many threads post deposits and withdrawals against the same account, first through
+# TransactionService.create_transaction (one conditional UPDATE), then through the previous
+# read-check-write implementation. After each run the account balance must equal the sum of the
+# committed transactions and must never go negative. This checks correctness only: on SQLite
+# with_for_update() is a no-op, so the old path runs without row locks and timing the two paths
+# against each other says nothing about the cost of real locking.
+# Usage: python benchmarks/balance_updates.py [threads] [operations per thread]
+#        (throwaway SQLite database unless DATABASE_URL is set)
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'balance_updates.db')}"
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from database import SessionLocal, engine, create_tables, User as DBUser, BankingPlatform as DBBankingPlatform, \
+    Account as DBAccount, Transaction as DBTransaction
+from models import TransactionCreate, TransactionType
+from services import TransactionService, RollupService
+
+STARTING_BALANCE = 100.0
+
+def read_modify_write(db, transaction: TransactionCreate, user_id: int):
+    # The previous implementation: load the account, check the balance in Python, write it back.
+    # FOR UPDATE makes it correct on Postgres; SQLite ignores it, so updates can be lost there.
+    account = db.scalars(
+        select(DBAccount).where(DBAccount.id == transaction.account_id).with_for_update()
+    ).first()
+    if transaction.transaction_type == TransactionType.EXPENSE:
+        if account.current_balance < transaction.amount:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Insufficient balance")
+        account.current_balance -= transaction.amount
+    else:
+        account.current_balance += transaction.amount
+    account.last_updated = datetime.utcnow()
+    db_transaction = DBTransaction(**transaction.dict(), user_id=user_id)
+    db.add(db_transaction)
+    RollupService.record(db, user_id, [db_transaction])
+    db.commit()
+    db.refresh(db_transaction)
+
+def setup(label: str):
+    db = SessionLocal()
+    user = DBUser(email=f"{label}-{time.time_ns()}@bench.local", hashed_password="-", full_name="Balance Bench")
+    platform = DBBankingPlatform(name=f"Bench {label} {time.time_ns()}", platform_type="bank")
+    db.add_all([user, platform])
+    db.flush()
+    account = DBAccount(user_id=user.id, platform_id=platform.id, account_name="Bench", account_type="checking",
+                        account_number="****0000", current_balance=STARTING_BALANCE)
+    db.add(account)
+    db.commit()
+    ids = user.id, account.id
+    db.close()
+    return ids
+
+def run(label: str, create, threads: int, operations: int):
+    user_id, account_id = setup(label)
+    stats = {"committed": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def worker(index):
+        db = SessionLocal()
+        try:
+            for i in range(operations):
+                # Withdrawals outnumber deposits so the balance regularly hits the floor
+                expense = (index + i) % 3 != 0
+                transaction = TransactionCreate(
+                    account_id=account_id, amount=7.0 if expense else 10.0, category="Bench", description="Bench",
+                    transaction_type=TransactionType.EXPENSE if expense else TransactionType.INCOME,
+                    transaction_date=datetime.utcnow()
+                )
+                try:
+                    create(db, transaction, user_id)
+                    outcome = "committed"
+                except HTTPException:
+                    outcome = "rejected"
+                except OperationalError:
+                    # e.g. SQLite "database is locked" when a writer waits past the busy timeout
+                    db.rollback()
+                    outcome = "errors"
+                with lock:
+                    stats[outcome] += 1
+        finally:
+            db.close()
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    db = SessionLocal()
+    balance = db.scalar(select(DBAccount.current_balance).where(DBAccount.id == account_id))
+    income = db.scalar(select(func.coalesce(func.sum(DBTransaction.amount), 0.0)).where(
+        DBTransaction.account_id == account_id, DBTransaction.transaction_type == TransactionType.INCOME))
+    expenses = db.scalar(select(func.coalesce(func.sum(DBTransaction.amount), 0.0)).where(
+        DBTransaction.account_id == account_id, DBTransaction.transaction_type == TransactionType.EXPENSE))
+    db.close()
+
+    # Money the balance gained (+) or lost (-) relative to the committed transactions
+    expected = STARTING_BALANCE + income - expenses
+    drift = balance - expected
+    consistent = abs(drift) < 1e-6 and balance >= 0
+    print(f"{label:<20} committed={stats['committed']} rejected={stats['rejected']} errors={stats['errors']}  "
+          f"balance={balance:.2f} expected={expected:.2f} drift={drift:+.2f}  "
+          f"{'OK' if consistent else 'LOST UPDATES'}")
+    return consistent
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    create_tables()
+    print(f"{engine.dialect.name}: {threads} threads x {operations} operations on one account")
+
+    atomic_ok = run("conditional update", TransactionService.create_transaction, threads, operations)
+    run("read-modify-write", read_modify_write, threads, operations)
+
+    if not atomic_ok:
+        print("\nConditional balance updates lost or overdrew money")
+        sys.exit(1)
+    print("\nConditional balance updates kept the account consistent")
+
+if __name__ == "__main__":
+    main()
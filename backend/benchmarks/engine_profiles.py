@@ -0,0 +1,120 @@
+# Concurrent write throughput per engine profile (DB_PROFILE).
+# Writer threads post transactions through TransactionService.create_transaction while reader
+# threads load the dashboard overview, against a fresh database per profile. Reports committed
+# writes/s, overview reads/s and how many operations failed with "database is locked".
+# Usage: python benchmarks/engine_profiles.py [writers] [readers] [seconds]
+#        (throwaway SQLite databases unless DATABASE_URL points at a server database)
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SERVER_URL = os.environ.get("DATABASE_URL") if not os.environ.get("DATABASE_URL", "sqlite").startswith("sqlite") else None
+WORK_DIR = tempfile.mkdtemp()
+if SERVER_URL is None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'unused.db')}"
+
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import services
+from database import Base, create_profiled_engine, DatabaseVersionRegistry, User as DBUser, \
+    BankingPlatform as DBBankingPlatform, Account as DBAccount
+from models import TransactionCreate, TransactionType
+from services import TransactionService, FinancialAnalyticsService
+
+PROFILES = ("default", "tuned")
+
+def setup(Session, accounts: int):
+    db = Session()
+    user = DBUser(email=f"profiles-{time.time_ns()}@bench.local", hashed_password="-", full_name="Profile Bench")
+    platform = DBBankingPlatform(name=f"Profile Bench {time.time_ns()}", platform_type="bank")
+    db.add_all([user, platform])
+    db.flush()
+    rows = [
+        DBAccount(user_id=user.id, platform_id=platform.id, account_name=f"Bench {index}", account_type="checking",
+                  account_number=f"****{index:04d}", current_balance=1000.0)
+        for index in range(accounts)
+    ]
+    db.add_all(rows)
+    db.commit()
+    ids = user.id, [row.id for row in rows]
+    db.close()
+    return ids
+
+def run(profile: str, writers: int, readers: int, seconds: float):
+    url = SERVER_URL or f"sqlite:///{os.path.join(WORK_DIR, f'{profile}.db')}"
+    engine = create_profiled_engine(url, profile)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # create_transaction bumps the user's data version after each commit; keep that write on the
+    # profile's database, as in the app (the global registry is bound to database.engine)
+    services.data_versions = DatabaseVersionRegistry(engine)
+    user_id, account_ids = setup(Session, writers)
+    stats = {"writes": 0, "reads": 0, "locked": 0, "other_errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def count(outcome):
+        with lock:
+            stats[outcome] += 1
+
+    def writer(index):
+        db = Session()
+        try:
+            while time.perf_counter() < deadline:
+                transaction = TransactionCreate(
+                    account_id=account_ids[index], amount=1.0, category="Bench", description="Bench",
+                    transaction_type=TransactionType.INCOME, transaction_date=datetime.utcnow()
+                )
+                try:
+                    TransactionService.create_transaction(db, transaction, user_id)
+                    count("writes")
+                except (OperationalError, HTTPException) as error:
+                    db.rollback()
+                    count("locked" if "locked" in str(error) else "other_errors")
+        finally:
+            db.close()
+
+    def reader():
+        db = Session()
+        try:
+            while time.perf_counter() < deadline:
+                try:
+                    FinancialAnalyticsService.get_financial_overview(db, user_id)
+                    db.rollback()
+                    count("reads")
+                except OperationalError as error:
+                    db.rollback()
+                    count("locked" if "locked" in str(error) else "other_errors")
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    print(f"{profile:<8} {stats['writes'] / elapsed:8.1f} writes/s {stats['reads'] / elapsed:8.1f} reads/s  "
+          f"locked={stats['locked']} other errors={stats['other_errors']}")
+    return stats
+
+def main():
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    print(f"{'server' if SERVER_URL else 'sqlite'}: {writers} writers, {readers} overview readers, {seconds:g}s per profile")
+    for profile in PROFILES:
+        run(profile, writers, readers, seconds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# Benchmark harness for the hot paths in services.py.
+# Seeds a reproducible synthetic dataset (generate_data.py), then measures latency percentiles and
+# throughput for the financial overview and rule-based AI advice (with warm and cold caches), the
+# transaction listing, creating a transaction and login, both through the app in-process
+# (FastAPI TestClient) and by calling the service classes directly. Results are written as JSON and can be compared against a saved run:
+#   python benchmarks/run.py --output baseline.json
+#   python benchmarks/run.py --baseline baseline.json   # exits 1 when a scenario regressed
+# (throwaway SQLite database unless DATABASE_URL is set)
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+# The advice scenarios measure the rule-based path, not a model provider
+os.environ["AI_PROVIDER"] = "rules"
+
+from fastapi.testclient import TestClient
+
+import main
+from database import SessionLocal, engine, create_tables
+from models import TransactionCreate, TransactionType
+from auth import authenticate_user
+from ai_providers import set_provider
+from services import FinancialAnalyticsService, FinancialHealthService, TransactionService, AIAssistantService
+from database import data_versions
+from generate_data import generate
+
+PERCENTILES = (50, 90, 95, 99)
+PASSWORD = "password123"
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    values = np.array(latencies) * 1000
+    summary = {f"p{p}_ms": round(float(value), 3) for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+    summary.update({
+        "mean_ms": round(float(values.mean()), 3),
+        "max_ms": round(float(values.max()), 3),
+        "ops_per_second": round(len(values) / elapsed, 1),
+        "iterations": len(values),
+    })
+    return summary
+
+def measure(operation, iterations: int, warmup: int, prepare=None) -> dict:
+    # operation(i) runs one iteration; the first `warmup` calls are not recorded. prepare(i), if
+    # given, runs before each call and is not timed (throughput covers the timed calls only).
+    for index in range(warmup):
+        if prepare:
+            prepare(index)
+        operation(index)
+    latencies = []
+    for index in range(warmup, warmup + iterations):
+        if prepare:
+            prepare(index)
+        begin = time.perf_counter()
+        operation(index)
+        latencies.append(time.perf_counter() - begin)
+    return summarize(latencies, sum(latencies))
+
+class Scenarios:
+    # Scenarios rotate over the benchmark users. After the first lap the overview, health and
+    # advice caches are warm, so the plain overview/advice scenarios mostly time cache hits;
+    # the *_cold variants invalidate the user's cached data before each (timed) call, so they
+    # measure FinancialAnalyticsService / FinancialHealthService / AIAssistantService themselves.
+    def __init__(self, client: TestClient, users: list):
+        self.client = client
+        self.users = users
+        self.loop = asyncio.new_event_loop()
+
+    def user(self, index: int) -> dict:
+        return self.users[index % len(self.users)]
+
+    def transaction(self, user: dict) -> TransactionCreate:
+        return TransactionCreate(
+            account_id=user["account_id"], amount=1.25, category="Benchmark", description="Benchmark",
+            transaction_type=TransactionType.INCOME, transaction_date=datetime.utcnow()
+        )
+
+    def invalidate(self, index):
+        # What a write would do: new data version (retires the overview and health entries)
+        data_versions.bump(self.user(index)["id"])
+        AIAssistantService.advice_cache.clear()
+
+    def check(self, response, status: int = 200):
+        if response.status_code != status:
+            raise RuntimeError(f"{response.request.method} {response.request.url}: {response.status_code} {response.text[:200]}")
+
+    # In-process HTTP
+    def http_overview(self, index):
+        user = self.user(index)
+        self.check(self.client.get("/api/analytics/overview", headers=user["headers"]))
+
+    def http_transactions(self, index):
+        user = self.user(index)
+        self.check(self.client.get("/api/transactions?limit=50", headers=user["headers"]))
+
+    def http_ai_advice(self, index):
+        user = self.user(index)
+        self.check(self.client.post("/api/ai/advice", json={"query": f"How can I save more money? ({index})"},
+                                    headers=user["headers"]))
+
+    def http_create_transaction(self, index):
+        user = self.user(index)
+        self.check(self.client.post("/api/transactions", content=self.transaction(user).model_dump_json(),
+                                    headers={**user["headers"], "Content-Type": "application/json"}))
+
+    def http_login(self, index):
+        user = self.user(index)
+        self.check(self.client.post("/api/login", data={"username": user["email"], "password": PASSWORD}))
+
+    # Service classes
+    def service(self, operation):
+        def run(index):
+            db = SessionLocal()
+            try:
+                operation(db, self.user(index), index)
+            finally:
+                db.close()
+        return run
+
+    def service_overview(self, db, user, index):
+        FinancialAnalyticsService.get_financial_overview(db, user["id"])
+
+    def service_transactions(self, db, user, index):
+        TransactionService.get_transactions_page(db, user["id"], 50)
+
+    def service_ai_advice(self, db, user, index):
+        snapshot = FinancialHealthService.get_snapshot(db, user["id"])
+        self.loop.run_until_complete(AIAssistantService.advise(snapshot, f"How can I save more money? ({index})"))
+
+    def service_create_transaction(self, db, user, index):
+        TransactionService.create_transaction(db, self.transaction(user), user["id"])
+
+    def service_login(self, db, user, index):
+        if not authenticate_user(db, user["email"], PASSWORD):
+            raise RuntimeError(f"login failed for {user['email']}")
+
+    def all(self, iterations: int) -> dict:
+        # name: (operation, iterations, untimed preparation); password hashing makes login far
+        # slower than the rest. service.overview builds the overview directly (never cached).
+        login_iterations = max(5, iterations // 10)
+        return {
+            "http.overview": (self.http_overview, iterations, None),
+            "http.overview_cold": (self.http_overview, iterations, self.invalidate),
+            "http.transactions": (self.http_transactions, iterations, None),
+            "http.ai_advice": (self.http_ai_advice, iterations, None),
+            "http.ai_advice_cold": (self.http_ai_advice, iterations, self.invalidate),
+            "http.create_transaction": (self.http_create_transaction, iterations, None),
+            "http.login": (self.http_login, login_iterations, None),
+            "service.overview": (self.service(self.service_overview), iterations, None),
+            "service.transactions": (self.service(self.service_transactions), iterations, None),
+            "service.ai_advice": (self.service(self.service_ai_advice), iterations, None),
+            "service.ai_advice_cold": (self.service(self.service_ai_advice), iterations, self.invalidate),
+            "service.create_transaction": (self.service(self.service_create_transaction), iterations, None),
+            "service.login": (self.service(self.service_login), login_iterations, None),
+        }
+
+def benchmark_users(client: TestClient, user_ids: list, email_prefix: str, count: int) -> list:
+    from database import Account as DBAccount
+    db = SessionLocal()
+    try:
+        users = []
+        for index, user_id in enumerate(user_ids[:count]):
+            email = f"{email_prefix}{index}@example.com"
+            account_id = db.query(DBAccount.id).filter(DBAccount.user_id == user_id).order_by(DBAccount.id).first()[0]
+            response = client.post("/api/login", data={"username": email, "password": PASSWORD})
+            token = response.json()["access_token"]
+            users.append({"id": user_id, "email": email, "account_id": account_id,
+                          "headers": {"Authorization": f"Bearer {token}"}})
+        return users
+    finally:
+        db.close()
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list:
+    # A scenario regressed when its p50 or p95 grew by more than `tolerance` (relative) and
+    # `min_delta_ms` (absolute, to ignore noise on sub-millisecond operations)
+    regressions = []
+    if baseline.get("meta", {}).get("dataset") != results["meta"]["dataset"]:
+        print("\nWarning: the baseline was measured on a different dataset")
+    print(f"\n{'scenario':<28} {'metric':<7} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in results["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = previous[metric], current[metric]
+            change = (after - before) / before if before else 0.0
+            regressed = change > tolerance and after - before > min_delta_ms
+            print(f"{name:<28} {metric:<7} {before:>10.3f} {after:>10.3f} {change:>+7.1%}{'  REGRESSION' if regressed else ''}")
+            if regressed:
+                regressions.append(f"{name} {metric}")
+    return regressions
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark the API and service hot paths")
+    parser.add_argument("--users", type=int, default=20, help="synthetic users to seed")
+    parser.add_argument("--accounts", type=int, default=3)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=200, help="measured calls per scenario")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", default="", help="comma-separated scenario name prefixes, e.g. http.,service.overview")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    create_tables()
+    set_provider(None)
+    email_prefix = f"bench{args.seed}-{int(time.time())}-"
+    dataset = generate(args.users, args.accounts, args.years, args.seed, email_prefix=email_prefix,
+                       password=PASSWORD, verbose=False)
+    print(f"Seeded {dataset['users']} users, {dataset['transactions']:,} transactions "
+          f"({engine.dialect.name}, seed {args.seed}) in {dataset['seconds']:.1f}s")
+
+    prefixes = [prefix for prefix in args.only.split(",") if prefix]
+    results = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "dataset": {key: dataset[key] for key in ("users", "accounts", "transactions", "goals")}
+                       | {"seed": args.seed, "years": args.years},
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+        },
+        "results": {},
+    }
+    with TestClient(main.app) as client:
+        scenarios = Scenarios(client, benchmark_users(client, dataset["user_ids"], email_prefix, min(args.users, 10)))
+        print(f"\n{'scenario':<28} {'p50 ms':>9} {'p90 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9}")
+        for name, (operation, iterations, prepare) in scenarios.all(args.iterations).items():
+            if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+                continue
+            summary = measure(operation, iterations, min(args.warmup, iterations), prepare)
+            results["results"][name] = summary
+            print(f"{name:<28} {summary['p50_ms']:>9.2f} {summary['p90_ms']:>9.2f} {summary['p95_ms']:>9.2f} "
+                  f"{summary['p99_ms']:>9.2f} {summary['ops_per_second']:>9.1f}")
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+        print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# CACHE_BACKEND: "memory" (per-process caches) or "redis" (caches shared by all workers).
+# Per-user data versions are always shared: in the database (database.DatabaseVersionRegistry)
+# or, with "redis", in Redis counters.
+# REDIS_URL=memory:// runs the Redis code path against the in-process LocalRedis stand-in.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+_MISSING = object()
+
+class TTLCache:
+    # Thread-safe LRU cache whose entries expire `ttl` seconds after they are set
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+class LocalRedis:
+    # In-process stand-in for the subset of the Redis client API used here
+    # (get / set with ex and nx / delete / incr); values come back as bytes like redis-py
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return entry[1] if entry else None
+
+    def set(self, key, value, ex=None, nx=False):
+        if isinstance(value, str):
+            value = value.encode()
+        elif isinstance(value, int):
+            value = str(value).encode()
+        with self._lock:
+            if nx and self._live(key):
+                return None
+            self._data[key] = (time.monotonic() + ex if ex else None, value)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def incr(self, key):
+        with self._lock:
+            entry = self._live(key)
+            value = int(entry[1]) + 1 if entry else 1
+            self._data[key] = (entry[0] if entry else None, str(value).encode())
+            return value
+
+class RedisTTLCache:
+    # TTLCache's get/set/delete on a Redis-compatible client; values must be bytes or str
+    def __init__(self, client, prefix: str, ttl: float):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = max(1, int(ttl))
+
+    def get(self, key, default=None):
+        value = self.client.get(self.prefix + str(key))
+        return default if value is None else value
+
+    def set(self, key, value):
+        self.client.set(self.prefix + str(key), value, ex=self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + str(key))
+
+class RedisVersionRegistry:
+    # Per-user data versions in Redis counters, shared by every worker. Caches key their entries
+    # by (user_id, version), so a bump makes every derived value for that user stale without
+    # tracking the entries individually.
+    def __init__(self, client, prefix: str = "finance:version:"):
+        self.client = client
+        self.prefix = prefix
+        client.set(prefix + "epoch", format(time.time_ns(), "x"), nx=True)
+        self.epoch = client.get(prefix + "epoch").decode()
+
+    def get(self, user_id: int) -> int:
+        value = self.client.get(f"{self.prefix}{user_id}")
+        return int(value) if value is not None else 0
+
+    def bump(self, user_id: int) -> int:
+        self.client.set(f"{self.prefix}written:{user_id}", repr(time.time()), ex=3600)
+        return self.client.incr(f"{self.prefix}{user_id}")
+
+    def wrote_within(self, user_id: int, seconds: float) -> bool:
+        written_at = self.client.get(f"{self.prefix}written:{user_id}")
+        return written_at is not None and time.time() - float(written_at) < seconds
+
+    def tag(self, user_id: int) -> str:
+        return f"{self.epoch}.{self.get(user_id)}"
+
+def create_redis_client():
+    if REDIS_URL.startswith("memory://"):
+        return LocalRedis()
+    import redis  # optional dependency, only needed with CACHE_BACKEND=redis
+
+    return redis.Redis.from_url(REDIS_URL)
+
+redis_client = create_redis_client() if CACHE_BACKEND == "redis" else None
+
+def shared_cache(prefix: str, maxsize: int, ttl: float):
+    # Cache for serialized (bytes) values: shared through Redis when configured, else per process
+    if redis_client is not None:
+        return RedisTTLCache(redis_client, f"finance:{prefix}:", ttl)
+    return TTLCache(maxsize=maxsize, ttl=ttl)
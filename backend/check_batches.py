@@ -0,0 +1,133 @@
+# Asserts the batch endpoint contracts: transactions only take "create" (any other action fails
+# per item with 400 and changes nothing), while goals and accounts also take update and delete;
+# and that a batch is one DB transaction (nothing is kept when it fails before the commit).
+# Usage: python check_batches.py   (runs against a throwaway SQLite database)
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "batches.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from database import SessionLocal, create_tables, data_versions, User as DBUser, BankingPlatform as DBBankingPlatform, \
+    Account as DBAccount, Transaction as DBTransaction, MonthlyRollup as DBMonthlyRollup
+from models import BatchOperation
+from auth import create_access_token
+from services import TransactionService, RollupService
+from main import app
+
+now = datetime.utcnow()
+
+def seed():
+    db = SessionLocal()
+    user = DBUser(email="batches@test.com", hashed_password="-", full_name="Batches")
+    platform = DBBankingPlatform(name="Batch Bank", platform_type="bank")
+    db.add_all([user, platform])
+    db.flush()
+    account = DBAccount(user_id=user.id, platform_id=platform.id, account_name="Main", account_type="checking",
+                        account_number="****0000", current_balance=100.0)
+    db.add(account)
+    db.commit()
+    ids = user.id, user.email, account.id
+    db.close()
+    return ids
+
+def stored_state(user_id: int, account_id: int):
+    # (transactions, balance, rollup transaction count) as another connection sees them
+    db = SessionLocal()
+    try:
+        return (db.query(DBTransaction).filter(DBTransaction.account_id == account_id).count(),
+                db.query(DBAccount.current_balance).filter(DBAccount.id == account_id).scalar(),
+                db.query(func.coalesce(func.sum(DBMonthlyRollup.transaction_count), 0))
+                .filter(DBMonthlyRollup.user_id == user_id).scalar())
+    finally:
+        db.close()
+
+def check_atomic(failures: list, user_id: int, account_id: int, transaction: dict):
+    # A batch commits once at the end: while it runs, and after a failure before the commit (here
+    # the rollup upsert), no row, balance change or rollup may be visible or left behind
+    before = stored_state(user_id, account_id)
+    seen_during = []
+
+    def failing_record(db, user_id, transactions):
+        seen_during.append(stored_state(user_id, account_id))
+        raise RuntimeError("rollup upsert failed")
+
+    record = RollupService.record
+    RollupService.record = failing_record
+    db = SessionLocal()
+    try:
+        TransactionService.run_batch(db, user_id, [BatchOperation(action="create", data=transaction)] * 3)
+        raised = False
+    except RuntimeError:
+        db.rollback()
+        raised = True
+    finally:
+        RollupService.record = record
+        db.close()
+    after = stored_state(user_id, account_id)
+    check(failures, raised and seen_during == [before],
+          f"batch items are not visible to other connections before the commit ({before} -> {seen_during})")
+    check(failures, after == before, f"a failure before the commit leaves nothing behind ({before} -> {after})")
+
+def check(failures: list, condition: bool, message: str):
+    print(f"{'OK  ' if condition else 'FAIL'}  {message}")
+    if not condition:
+        failures.append(message)
+
+def main():
+    create_tables()
+    user_id, email, account_id = seed()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email, 'uid': user_id})}"}
+    client = TestClient(app)
+    failures = []
+
+    transaction = {"account_id": account_id, "amount": 5.0, "category": "Batch", "description": "Batch",
+                   "transaction_type": "income", "transaction_date": (now - timedelta(hours=1)).isoformat()}
+    response = client.post("/api/transactions/batch", headers=headers, json={"operations": [
+        {"action": "create", "data": transaction},
+        {"action": "update", "id": 1, "data": transaction},
+        {"action": "delete", "id": 1},
+    ]})
+    check(failures, response.status_code == 200, f"POST /api/transactions/batch answers 200 ({response.status_code})")
+    results = response.json()["results"]
+    check(failures, results[0]["success"], "transaction create succeeds")
+    for result, action in zip(results[1:], ("update", "delete")):
+        check(failures, not result["success"] and result["status_code"] == 400,
+              f"transaction {action} fails with 400 ({result['status_code']}: {result['error']})")
+
+    db = SessionLocal()
+    stored = db.query(DBTransaction).filter(DBTransaction.user_id == user_id).count()
+    balance = db.query(DBAccount.current_balance).filter(DBAccount.id == account_id).scalar()
+    db.close()
+    check(failures, stored == 1 and abs(balance - 105.0) < 1e-9,
+          f"only the create was applied ({stored} transaction(s), balance {balance:.2f})")
+
+    version = data_versions.get(user_id)
+    response = client.post("/api/transactions/batch", headers=headers, json={"operations": [{"action": "delete", "id": 1}]})
+    check(failures, response.json()["succeeded"] == 0 and data_versions.get(user_id) == version,
+          "a batch where every item failed leaves the data version (ETags, caches) unchanged")
+
+    check_atomic(failures, user_id, account_id, transaction)
+
+    goal = {"goal_name": "Batch goal", "goal_type": "savings", "target_amount": 1000.0,
+            "target_date": (now + timedelta(days=365)).isoformat()}
+    created = client.post("/api/goals/batch", headers=headers, json={"operations": [{"action": "create", "data": goal}]})
+    goal_id = created.json()["results"][0]["id"]
+    response = client.post("/api/goals/batch", headers=headers, json={"operations": [
+        {"action": "update", "id": goal_id, "data": {**goal, "goal_name": "Renamed"}},
+        {"action": "delete", "id": goal_id},
+    ]})
+    check(failures, all(result["success"] for result in response.json()["results"]), "goal update and delete succeed")
+
+    if failures:
+        print(f"\n{len(failures)} batch contract check(s) failed")
+        sys.exit(1)
+    print("\nBatch endpoints follow their contracts")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Asserts that ETags and the cached overview follow writes made by another worker process.
+# The "other worker" is a second version registry on its own engine (or Redis client): it
+# writes to the database and bumps the user's version, after which a request carrying the old
+# ETag must get a fresh 200 (with the new data), not a 304 or the cached body.
+# Usage: python check_conditional_gets.py   (runs against a throwaway SQLite database)
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "conditional_gets.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from database import DATABASE_URL, SessionLocal, create_tables, create_profiled_engine, data_versions, \
+    DatabaseVersionRegistry, User as DBUser, BankingPlatform as DBBankingPlatform, Account as DBAccount, \
+    FinancialGoal as DBFinancialGoal
+from cache import redis_client, RedisVersionRegistry
+from auth import create_access_token
+from main import app
+
+now = datetime.utcnow()
+
+ENDPOINTS = ["/api/accounts", "/api/transactions", "/api/goals", "/api/analytics/overview"]
+
+def seed():
+    db = SessionLocal()
+    user = DBUser(email="etags@test.com", hashed_password="-", full_name="ETags")
+    platform = DBBankingPlatform(name="ETag Bank", platform_type="bank")
+    db.add_all([user, platform])
+    db.flush()
+    account = DBAccount(user_id=user.id, platform_id=platform.id, account_name="Main", account_type="checking",
+                        account_number="****0000", current_balance=100.0)
+    db.add(account)
+    db.add(DBFinancialGoal(user_id=user.id, goal_name="Goal", goal_type="savings", target_amount=1000.0,
+                           current_amount=0.0, target_date=now + timedelta(days=365)))
+    db.commit()
+    ids = user.id, user.email, account.id
+    db.close()
+    data_versions.bump(user.id)
+    return ids
+
+def other_worker():
+    # Separate engine and registry, sharing only the database (or Redis) with this process
+    engine = create_profiled_engine(DATABASE_URL)
+    if isinstance(data_versions, RedisVersionRegistry):
+        return sessionmaker(bind=engine), RedisVersionRegistry(redis_client)
+    return sessionmaker(bind=engine), DatabaseVersionRegistry(engine)
+
+def check(failures: list, condition: bool, message: str):
+    print(f"{'OK  ' if condition else 'FAIL'}  {message}")
+    if not condition:
+        failures.append(message)
+
+def main():
+    create_tables()
+    user_id, email, account_id = seed()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email, 'uid': user_id})}"}
+    client = TestClient(app)
+    failures = []
+
+    etags = {}
+    for path in ENDPOINTS:
+        response = client.get(path, headers=headers)
+        etags[path] = response.headers.get("etag")
+        check(failures, response.status_code == 200 and etags[path], f"GET {path} returns an ETag")
+        repeat = client.get(path, headers={**headers, "If-None-Match": etags[path]})
+        check(failures, repeat.status_code == 304, f"GET {path} with the current ETag is 304 ({repeat.status_code})")
+
+    # Another worker changes the balance and bumps the version; this process's caches are warm
+    Session, registry = other_worker()
+    with Session() as db:
+        db.execute(update(DBAccount).where(DBAccount.id == account_id).values(current_balance=250.0))
+        db.commit()
+    registry.bump(user_id)
+
+    for path in ENDPOINTS:
+        response = client.get(path, headers={**headers, "If-None-Match": etags[path]})
+        check(failures, response.status_code == 200 and response.headers.get("etag") != etags[path],
+              f"GET {path} with the old ETag after another worker's write is 200 ({response.status_code})")
+    overview = client.get("/api/analytics/overview", headers=headers).json()
+    check(failures, abs(overview["total_balance"] - 250.0) < 1e-9,
+          f"the overview is rebuilt, not served from the cache (total_balance {overview['total_balance']})")
+    balance = client.get("/api/accounts", headers=headers).json()[0]["current_balance"]
+    check(failures, abs(balance - 250.0) < 1e-9, f"accounts show the new balance ({balance})")
+
+    if failures:
+        print(f"\n{len(failures)} conditional GET check(s) failed")
+        sys.exit(1)
+    print("\nETags and cached overviews follow writes from other workers")
+
+if __name__ == "__main__":
+    main()
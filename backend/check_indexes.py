@@ -0,0 +1,120 @@
+# Verifies with EXPLAIN that the hot per-user queries are served by the composite indexes.
+# Usage: python check_indexes.py   (uses DATABASE_URL, applies migrations first)
+import sys
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from database import SessionLocal, engine, create_tables
+from services import AccountService, TransactionService, FinancialGoalService
+
+def _cursor():
+    return TransactionService.encode_cursor(SimpleNamespace(transaction_date=datetime.utcnow(), id=1000))
+
+# (description, service call, acceptable indexes)
+CHECKS = [
+    (
+        "transaction history",
+        lambda db: TransactionService.get_user_transactions(db, 1, 50),
+        ["ix_transactions_user_date"],
+    ),
+    (
+        "transaction page after cursor",
+        lambda db: TransactionService.get_transactions_page(db, 1, 50, _cursor()),
+        ["ix_transactions_user_date"],
+    ),
+    (
+        "transaction page filtered by account",
+        lambda db: TransactionService.get_transactions_page(db, 1, 50, _cursor(), account_id=1),
+        ["ix_transactions_user_account_date"],
+    ),
+    (
+        "transaction page filtered by category",
+        lambda db: TransactionService.get_transactions_page(db, 1, 50, category="Food & Dining"),
+        ["ix_transactions_user_category_date"],
+    ),
+    (
+        "transaction page filtered by type",
+        lambda db: TransactionService.get_transactions_page(db, 1, 50, transaction_type="expense"),
+        ["ix_transactions_user_type_date"],
+    ),
+    (
+        "transactions by period",
+        lambda db: TransactionService.get_transactions_by_period(
+            db, 1, datetime.utcnow() - timedelta(days=30), datetime.utcnow()
+        ),
+        ["ix_transactions_user_date", "ix_transactions_user_type_date"],
+    ),
+    (
+        "monthly aggregate",
+        lambda db: TransactionService.aggregate_by_period(
+            db, 1, datetime.utcnow() - timedelta(days=30), datetime.utcnow()
+        ),
+        ["ix_transactions_user_date", "ix_transactions_user_type_date"],
+    ),
+    (
+        "active accounts",
+        lambda db: AccountService.get_user_accounts(db, 1),
+        ["ix_accounts_user_active"],
+    ),
+    (
+        "active goals",
+        lambda db: FinancialGoalService.get_user_goals(db, 1),
+        ["ix_financial_goals_user_active"],
+    ),
+]
+
+def capture_statements(db, call):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+def explain(statement, parameters):
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if engine.dialect.name == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+        # Small tables make Postgres prefer sequential scans; we only care whether the index is usable
+        cursor.execute("SET enable_seqscan = off")
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        return "\n".join(str(row[0]) for row in cursor.fetchall())
+    finally:
+        raw.close()
+
+def main():
+    create_tables()
+    db = SessionLocal()
+    failures = 0
+
+    try:
+        for description, call, indexes in CHECKS:
+            statements = capture_statements(db, call)
+            plan = "\n".join(explain(statement, parameters) for statement, parameters in statements)
+            used = [index for index in indexes if index in plan]
+            if used:
+                print(f"OK    {description}: uses {used[0]}")
+            else:
+                failures += 1
+                print(f"FAIL  {description}: none of {indexes} used")
+                print("      " + plan.replace("\n", "\n      "))
+    finally:
+        db.close()
+
+    if failures:
+        print(f"\n{failures} query plan check(s) failed")
+        sys.exit(1)
+    print("\nAll query plans use the expected indexes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Asserts that migrating a database holding float dollars to integer cents (0006) leaves every
+# monthly rollup equal to the sum and count of its transactions, including amounts whose float
+# sum rounds to a different cent than the sum of the rounded amounts.
+# Usage: python check_migrations.py   (runs against a throwaway SQLite database)
+import os
+import sys
+import tempfile
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "migrations.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+
+from database import BASE_DIR, engine
+
+# (category, amount in dollars) for one user and month; 3 x 0.105 rounds to 33 cents one by one
+# but to 32 cents as a float sum, which is what converting the old rollup total would store
+TRANSACTIONS = [("Coffee", 0.105)] * 3 + [("Groceries", 0.005)] * 2 + [("Groceries", 12.345), (None, 1.1)]
+
+ROLLUPS = text("SELECT user_id, year, month, transaction_type, category, total_amount, transaction_count "
+               "FROM monthly_rollups ORDER BY category")
+SUMS = text("SELECT user_id, CAST(strftime('%Y', transaction_date) AS INTEGER), "
+            "CAST(strftime('%m', transaction_date) AS INTEGER), transaction_type, COALESCE(category, ''), "
+            "SUM(amount), COUNT(id) FROM transactions GROUP BY 1, 2, 3, 4, 5 ORDER BY 5")
+
+def upgrade(revision: str):
+    config = Config(os.path.join(BASE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BASE_DIR, "migrations"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+def seed():
+    # Written before the rollup table exists, so 0004 fills it from these float amounts
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO users (id, email, hashed_password, full_name, is_active) "
+                                "VALUES (1, 'migrations@test.com', '-', 'Migrations', 1)"))
+        connection.execute(text("INSERT INTO banking_platforms (id, name, platform_type, is_active) "
+                                "VALUES (1, 'Migration Bank', 'bank', 1)"))
+        connection.execute(text("INSERT INTO accounts (id, user_id, platform_id, account_name, account_type, "
+                                "account_number, current_balance, is_active) "
+                                "VALUES (1, 1, 1, 'Main', 'checking', '****0000', 100.0, 1)"))
+        for category, amount in TRANSACTIONS:
+            connection.execute(text("INSERT INTO transactions (user_id, account_id, amount, category, description, "
+                                    "transaction_type, transaction_date) "
+                                    "VALUES (1, 1, :amount, :category, 'Migration', 'expense', '2026-03-15 12:00:00')"),
+                               {"amount": amount, "category": category})
+
+def check(failures: list, condition: bool, message: str):
+    print(f"{'OK  ' if condition else 'FAIL'}  {message}")
+    if not condition:
+        failures.append(message)
+
+def main():
+    upgrade("0003")
+    seed()
+    upgrade("head")
+    failures = []
+
+    with engine.connect() as connection:
+        rollups = [tuple(row) for row in connection.execute(ROLLUPS)]
+        sums = [tuple(row) for row in connection.execute(SUMS)]
+    check(failures, len(rollups) == 3, f"one rollup per category ({len(rollups)})")
+    check(failures, rollups == sums, f"rollup totals and counts equal the transaction cents ({rollups} vs {sums})")
+    coffee = next((row for row in rollups if row[4] == "Coffee"), None)
+    check(failures, coffee is not None and coffee[5] == 33,
+          f"three 0.105 amounts roll up to 33 cents, not the rounded float sum ({coffee and coffee[5]})")
+
+    if failures:
+        print(f"\n{len(failures)} migration check(s) failed")
+        sys.exit(1)
+    print("\nMigrated rollups match their transactions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Asserts that each read endpoint issues a fixed number of SQL statements, whatever the row count.
+# Usage: python check_query_counts.py   (runs against a throwaway SQLite database)
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "query_counts.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from database import SessionLocal, engine, async_engine, create_tables, data_versions, User as DBUser, BankingPlatform as DBBankingPlatform, \
+    Account as DBAccount, Transaction as DBTransaction, FinancialGoal as DBFinancialGoal
+from auth import create_access_token
+from services import RollupService
+from main import app
+
+now = datetime.utcnow()
+
+ENDPOINTS = [
+    ("GET", "/api/accounts", None),
+    ("GET", "/api/transactions", None),
+    ("GET", "/api/transactions/compact", None),
+    ("GET", "/api/goals", None),
+    ("GET", "/api/analytics/overview", None),
+    ("GET", f"/api/analytics/monthly/{now.year}/{now.month}", None),
+    ("GET", "/api/analytics/history", None),
+    ("GET", "/api/analytics/trends", None),
+    ("GET", "/api/analytics/health", None),
+    ("GET", "/api/analytics/categories", None),
+    ("POST", "/api/ai/advice", {"query": "How can I save more?"}),
+    ("POST", "/api/ai/advice/stream", {"query": "How can I save more?"}),
+]
+
+def seed(db, user, size):
+    # `size` platforms, accounts and goals, and 10 * size transactions spread across the accounts
+    offset = db.query(DBBankingPlatform).count()
+    platforms = [DBBankingPlatform(name=f"Platform {offset + i}", platform_type="bank") for i in range(size)]
+    db.add_all(platforms)
+    db.flush()
+    accounts = [
+        DBAccount(user_id=user.id, platform_id=platform.id, account_name=f"Account {platform.id}",
+                  account_type="checking", account_number="****0000", current_balance=1000.0)
+        for platform in platforms
+    ]
+    db.add_all(accounts)
+    db.flush()
+    for i in range(10 * size):
+        db.add(DBTransaction(
+            user_id=user.id, account_id=accounts[i % size].id,
+            transaction_type="expense" if i % 3 else "income", category=f"Category {i % 5}",
+            amount=10.0 + i, description="Seeded", transaction_date=now - timedelta(hours=i)
+        ))
+    for i in range(size):
+        db.add(DBFinancialGoal(user_id=user.id, goal_name=f"Goal {offset + i}", goal_type="savings",
+                               target_amount=1000.0, current_amount=100.0, target_date=now + timedelta(days=365)))
+    db.commit()
+    RollupService.rebuild(db, user.id)
+    # Seeding bypasses the services, so invalidate the per-user caches the way they would
+    data_versions.bump(user.id)
+
+def count_queries(client, headers):
+    counts = {}
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Warm the authenticated-user cache so every endpoint is measured the same way
+    client.get("/api/me", headers=headers)
+    # With ASYNC_DB enabled the read endpoints go through the async engine
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    for target in engines:
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        for method, path, body in ENDPOINTS:
+            statements.clear()
+            response = client.request(method, path, json=body, headers=headers)
+            assert response.status_code == 200, f"{method} {path}: {response.status_code} {response.text}"
+            counts[(method, path)] = len(statements)
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+    return counts
+
+def main():
+    create_tables()
+    db = SessionLocal()
+    user = DBUser(email="counts@test.com", hashed_password="-", full_name="Query Counts")
+    db.add(user)
+    db.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email, 'uid': user.id})}"}
+    client = TestClient(app)
+
+    seed(db, user, 2)
+    small = count_queries(client, headers)
+    seed(db, user, 20)
+    large = count_queries(client, headers)
+    db.close()
+
+    failures = 0
+    for key, small_count in small.items():
+        method, path = key
+        status = "OK  " if small_count == large[key] else "FAIL"
+        failures += status == "FAIL"
+        print(f"{status}  {method} {path}: {small_count} queries (small), {large[key]} queries (large)")
+
+    if failures:
+        print(f"\n{failures} endpoint(s) issue more queries as data grows")
+        sys.exit(1)
+    print("\nQuery counts are independent of row counts")
+
+if __name__ == "__main__":
+    main()
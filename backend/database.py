@@ -1,20 +1,142 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import create_engine, event, inspect, select, update, Column, Integer, BigInteger, String, Float, DateTime, Boolean, ForeignKey, Text, Index
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
+from cache import redis_client, RedisVersionRegistry
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./finance_app.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+# Engine profiles. DB_PROFILE=default (the default) keeps SQLAlchemy's and the driver's defaults;
+# DB_PROFILE=tuned is opt-in and applies the SQLite pragmas / connection pool settings below.
+# On SQLite, tuned switches the database file to WAL (persistent, adds -wal/-shm files next to
+# it) and synchronous=NORMAL, which can lose the last commits on power loss or an OS crash.
+DB_PROFILE = os.getenv("DB_PROFILE", "default").lower()
+
+# WAL lets readers run alongside the single writer instead of blocking it, and busy_timeout makes
+# a writer wait for the lock rather than fail with "database is locked"
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000")),
+    # Negative values are KiB rather than pages
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+}
+
+# Connection pool for server databases (PostgreSQL)
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+}
+
+def engine_options(url: str, profile: str = DB_PROFILE) -> dict:
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}} if "aiosqlite" not in url else {}
+    return dict(POOL_SETTINGS) if profile == "tuned" else {}
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+# pysqlite only BEGINs implicitly before INSERT/UPDATE/DELETE and never before a SAVEPOINT, so
+# with the driver's defaults begin_nested() commits each savepoint on its own and a batch is not
+# one transaction. When a savepoint is opened outside a driver transaction, BEGIN IMMEDIATE first:
+# the batch then commits (or rolls back) as a whole, waiting for the write lock up front instead
+# of failing on a lock upgrade. Plain reads keep pysqlite's autocommit behaviour, so they do not
+# hold a lock for the life of the session (as the usual isolation_level=None recipe would).
+def begin_sqlite_savepoint_transaction(connection, name):
+    if not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+def create_profiled_engine(url: str, profile: str = DB_PROFILE):
+    new_engine = create_engine(url, **engine_options(url, profile))
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine, "savepoint", begin_sqlite_savepoint_transaction)
+        if profile == "tuned":
+            event.listen(new_engine, "connect", apply_sqlite_pragmas)
+    return new_engine
+
+engine = create_profiled_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for the GET endpoints; without one, reads use the primary.
+# A user who wrote within READ_YOUR_WRITES_SECONDS keeps reading from the primary, so the
+# window should exceed the replica's usual lag.
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+read_engine = create_profiled_engine(READ_DATABASE_URL) if READ_DATABASE_URL else engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if READ_DATABASE_URL else SessionLocal
+
+# Optional async engine (aiosqlite / asyncpg) used by the async read endpoints when ASYNC_DB is enabled
+ASYNC_DB_ENABLED = os.getenv("ASYNC_DB", "false").lower() in ("1", "true", "yes")
+
+def to_async_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith("postgresql:") or url.startswith("postgres:"):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+ASYNC_READ_DATABASE_URL = os.getenv("ASYNC_READ_DATABASE_URL") or (
+    to_async_url(READ_DATABASE_URL) if READ_DATABASE_URL else None
+)
+
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+if ASYNC_DB_ENABLED:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    def create_profiled_async_engine(url: str):
+        new_engine = create_async_engine(url, **engine_options(url))
+        if DB_PROFILE == "tuned" and new_engine.dialect.name == "sqlite":
+            event.listen(new_engine.sync_engine, "connect", apply_sqlite_pragmas)
+        return new_engine
+
+    async_engine = create_profiled_async_engine(ASYNC_DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = AsyncSessionLocal
+    if ASYNC_READ_DATABASE_URL:
+        async_read_engine = create_profiled_async_engine(ASYNC_READ_DATABASE_URL)
+        AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+# Currency amounts are stored as integer cents (migration 0006), so balance updates and SUM()
+# in SQL are exact; the ORM and the API keep working in float dollars.
+def to_cents(value) -> int:
+    return int(round(float(value) * 100))
+
+def from_cents(cents) -> float:
+    # int() also accepts the Decimal that PostgreSQL returns for SUM(bigint)
+    return int(cents) / 100
+
+class Money(TypeDecorator):
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else from_cents(value)
+
 # Models following MVVM pattern
 
 class User(Base):
@@ -26,6 +148,9 @@ class User(Base):
     full_name = Column(String)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped after every committed write to the user's data (see DatabaseVersionRegistry)
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)
+    data_written_at = Column(DateTime, nullable=True)
     
     # Relationships
     accounts = relationship("Account", back_populates="owner")
@@ -54,12 +179,16 @@ class Account(Base):
     account_name = Column(String)
     account_type = Column(String)  # checking, savings, credit, investment
     account_number = Column(String)
-    current_balance = Column(Float, default=0.0)
+    current_balance = Column(Money, default=0.0)
     currency = Column(String, default="USD")
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_updated = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index("ix_accounts_user_active", "user_id", "is_active"),
+    )
+    
     # Relationships
     owner = relationship("User", back_populates="accounts")
     platform = relationship("BankingPlatform", back_populates="accounts")
@@ -73,11 +202,19 @@ class Transaction(Base):
     account_id = Column(Integer, ForeignKey("accounts.id"))
     transaction_type = Column(String)  # income, expense, transfer
     category = Column(String)
-    amount = Column(Float)
+    amount = Column(Money)
     description = Column(Text)
     transaction_date = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Composite indexes for the per-user history and period queries
+    __table_args__ = (
+        Index("ix_transactions_user_date", "user_id", "transaction_date"),
+        Index("ix_transactions_user_type_date", "user_id", "transaction_type", "transaction_date"),
+        Index("ix_transactions_user_account_date", "user_id", "account_id", "transaction_date"),
+        Index("ix_transactions_user_category_date", "user_id", "category", "transaction_date"),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="transactions")
     account = relationship("Account", back_populates="transactions")
@@ -89,13 +226,17 @@ class FinancialGoal(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     goal_name = Column(String)
     goal_type = Column(String)  # savings, debt_reduction, investment
-    target_amount = Column(Float)
-    current_amount = Column(Float, default=0.0)
+    target_amount = Column(Money)
+    current_amount = Column(Money, default=0.0)
     target_date = Column(DateTime)
     priority = Column(String, default="medium")  # high, medium, low
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index("ix_financial_goals_user_active", "user_id", "is_active"),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="goals")
 
@@ -110,6 +251,31 @@ class FinancialMetric(Base):
     calculation_date = Column(DateTime, default=datetime.utcnow)
     period_start = Column(DateTime)
     period_end = Column(DateTime)
+    
+    # One materialized row per (user, metric, period)
+    __table_args__ = (
+        Index("uq_financial_metrics_user_type_period", "user_id", "metric_type", "period_start", unique=True),
+    )
+
+class MonthlyRollup(Base):
+    __tablename__ = "monthly_rollups"
+    
+    # Per-user monthly sums maintained by TransactionService, rebuildable from transactions
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    transaction_type = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)
+    total_amount = Column(Money, default=0.0)
+    transaction_count = Column(Integer, default=0)
+
+# INSERT ... ON CONFLICT for the dialect behind the session (SQLite and PostgreSQL)
+def dialect_insert(db, model):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
 
 # Database dependency
 def get_db():
@@ -119,6 +285,72 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+class DatabaseVersionRegistry:
+    # Per-user data version stored in users.data_version on the primary database. ETags and
+    # caches key on it, so it must be the same in every worker process: a counter held in one
+    # process would keep validating stale responses after a write handled by another worker.
+    # Same interface as cache.RedisVersionRegistry (used instead with CACHE_BACKEND=redis).
+    epoch = "db"
+
+    def __init__(self, bind):
+        self.bind = bind
+
+    def get(self, user_id: int) -> int:
+        with self.bind.connect() as connection:
+            return connection.scalar(select(User.data_version).where(User.id == user_id)) or 0
+
+    def bump(self, user_id: int) -> int:
+        with self.bind.begin() as connection:
+            connection.execute(
+                update(User).where(User.id == user_id)
+                .values(data_version=User.data_version + 1, data_written_at=datetime.utcnow())
+            )
+            return connection.scalar(select(User.data_version).where(User.id == user_id)) or 0
+
+    def wrote_within(self, user_id: int, seconds: float) -> bool:
+        # Whether the user committed a write in the last `seconds` (read-your-writes routing)
+        with self.bind.connect() as connection:
+            written_at = connection.scalar(select(User.data_written_at).where(User.id == user_id))
+        return written_at is not None and datetime.utcnow() - written_at < timedelta(seconds=seconds)
+
+    def tag(self, user_id: int) -> str:
+        return f"{self.epoch}.{self.get(user_id)}"
+
+data_versions = RedisVersionRegistry(redis_client) if redis_client is not None else DatabaseVersionRegistry(engine)
+
+# Read sessions (see READ_DATABASE_URL); the per-user dependencies are in auth.py
+def read_session(user_id: int):
+    if ReadSessionLocal is SessionLocal or data_versions.wrote_within(user_id, READ_YOUR_WRITES_SECONDS):
+        return SessionLocal()
+    return ReadSessionLocal()
+
+def async_read_session(user_id: int):
+    if AsyncReadSessionLocal is AsyncSessionLocal or data_versions.wrote_within(user_id, READ_YOUR_WRITES_SECONDS):
+        return AsyncSessionLocal()
+    return AsyncReadSessionLocal()
+
+# Alembic migrations
+BASELINE_REVISION = "0001"
+
+def run_migrations():
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BASE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BASE_DIR, "migrations"))
+
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        # Databases created with create_all() before migrations existed
+        if "alembic_version" not in tables and "users" in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+
 # Create tables
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    run_migrations()
@@ -0,0 +1,103 @@
+import csv
+import importlib.util
+import io
+import json
+
+# Streaming encoders for transaction exports. Each takes an iterator of row chunks (as produced
+# by TransactionService.export_chunks) and yields the encoded file piece by piece, so only one
+# chunk is held in memory at a time.
+EXPORT_COLUMNS = ["id", "transaction_date", "transaction_type", "category", "amount", "description",
+                  "account_id", "account_name"]
+
+# Parquet needs pyarrow, which is optional
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_FORMATS = {
+    # format: (media type, file extension)
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+def export_record(row) -> dict:
+    return {
+        "id": row.id,
+        "transaction_date": row.transaction_date.isoformat() if row.transaction_date else None,
+        "transaction_type": row.transaction_type,
+        "category": row.category,
+        "amount": row.amount,
+        "description": row.description,
+        "account_id": row.account_id,
+        "account_name": row.account_name,
+    }
+
+def stream_csv(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in chunks:
+        for row in chunk:
+            record = export_record(row)
+            writer.writerow([record[column] for column in EXPORT_COLUMNS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, when there are no transactions
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def stream_ndjson(chunks):
+    for chunk in chunks:
+        yield "".join(json.dumps(export_record(row)) + "\n" for row in chunk)
+
+class _DrainableSink(io.RawIOBase):
+    # Write-only file that hands back what has been written since the last drain, while
+    # reporting the total position to the Parquet writer (which records offsets in the footer)
+    def __init__(self):
+        self.pieces = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.pieces.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.pieces)
+        self.pieces = []
+        return data
+
+def stream_parquet(chunks):
+    # One row group per chunk
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("transaction_date", pa.timestamp("us")),
+        ("transaction_type", pa.string()),
+        ("category", pa.string()),
+        ("amount", pa.float64()),
+        ("description", pa.string()),
+        ("account_id", pa.int64()),
+        ("account_name", pa.string()),
+    ])
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    for chunk in chunks:
+        columns = {column: [getattr(row, column) for row in chunk] for column in EXPORT_COLUMNS}
+        writer.write_table(pa.table(columns, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+ENCODERS = {"csv": stream_csv, "ndjson": stream_ndjson, "parquet": stream_parquet}
+
+def encode_export(chunks, export_format: str):
+    return ENCODERS[export_format](chunks)
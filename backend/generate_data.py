@@ -0,0 +1,273 @@
+# Seedable synthetic data generator for benchmarks: N users with M accounts each and years of
+# transactions with realistic category/amount distributions. Rows are generated with NumPy per
+# chunk of users and written with bulk core INSERTs; the same arguments (including --seed and
+# --end-date) always produce the same data.
+# Usage: python generate_data.py [--users 1000] [--accounts 3] [--years 2] [--seed 42]
+#        e.g. --users 10000 --years 2 writes about 10M transactions
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select, insert, update, bindparam, table, column, Integer, BigInteger, String, Text, \
+    DateTime, Boolean
+
+from database import SessionLocal, create_tables, BankingPlatform as DBBankingPlatform, User as DBUser, \
+    Account as DBAccount
+from auth import get_password_hash
+from services import RollupService
+from init_data import init_banking_platforms
+
+EXPENSE_CATEGORIES = [
+    # (category, share of purchases, median amount in dollars, log-normal sigma)
+    ("Food & Dining", 0.28, 24.0, 0.6),
+    ("Groceries", 0.18, 65.0, 0.5),
+    ("Transportation", 0.14, 32.0, 0.6),
+    ("Shopping", 0.13, 55.0, 0.9),
+    ("Entertainment", 0.08, 30.0, 0.7),
+    ("Bills & Utilities", 0.07, 110.0, 0.5),
+    ("Personal Care", 0.06, 35.0, 0.6),
+    ("Healthcare", 0.04, 85.0, 1.0),
+    ("Education", 0.02, 150.0, 0.8),
+]
+ACCOUNT_TYPES = ["checking", "savings", "credit", "investment"]
+GOAL_TYPES = ["savings", "debt_reduction", "investment"]
+PRIORITIES = ["high", "medium", "low"]
+
+# Plain table clauses with the raw column types: amounts are generated as integer cents and
+# written as-is, skipping the per-value conversion of database.Money
+transactions_table = table(
+    "transactions",
+    column("user_id", Integer), column("account_id", Integer), column("transaction_type", String),
+    column("category", String), column("amount", BigInteger), column("description", Text),
+    column("transaction_date", DateTime), column("created_at", DateTime),
+)
+sqlite_transactions_table = table(
+    "transactions",
+    *[column(c.name, String if isinstance(c.type, DateTime) else c.type) for c in transactions_table.columns]
+)
+accounts_table = table("accounts", column("id", Integer), column("current_balance", BigInteger))
+goals_table = table(
+    "financial_goals",
+    column("user_id", Integer), column("goal_name", String), column("goal_type", String),
+    column("target_amount", BigInteger), column("current_amount", BigInteger), column("target_date", DateTime),
+    column("priority", String), column("is_active", Boolean), column("created_at", DateTime),
+)
+
+def cents(rng, median: float, sigma: float, size) -> np.ndarray:
+    return np.maximum(np.rint(rng.lognormal(np.log(median), sigma, size) * 100), 1).astype(np.int64)
+
+def month_rows(month_index: np.ndarray, months: np.ndarray, day=None, rng=None) -> np.ndarray:
+    # Timestamps in the given months: on a fixed day, or on a random day and time
+    starts = months[month_index].astype("datetime64[s]")
+    if day is not None:
+        return starts + np.timedelta64((day - 1) * 86400 + 9 * 3600, "s")
+    lengths = ((months[month_index] + 1).astype("datetime64[D]") - months[month_index].astype("datetime64[D]")).astype(np.int64)
+    return starts + (rng.random(len(month_index)) * lengths * 86400).astype("timedelta64[s]")
+
+def generate_transactions(rng, account_ids: np.ndarray, months: np.ndarray, end: np.datetime64,
+                          expenses_per_month: float) -> dict:
+    # Column arrays for every transaction of a chunk of users (account_ids is users x accounts)
+    user_count, account_count = account_ids.shape
+    month_count = len(months)
+    user_month = np.arange(user_count * month_count)
+    users, month_index = user_month // month_count, user_month % month_count
+    parts = []
+
+    # Salary twice a month and rent on the 1st, into the first (checking) account
+    paycheck = cents(rng, 65000 / 24, 0.4, user_count)
+    rent = cents(rng, 1400, 0.35, user_count)
+    for day in (1, 15):
+        noise = 1 + rng.normal(0, 0.01, len(users))
+        parts.append((users, 0, month_rows(month_index, months, day), "income", "Salary", "Monthly Salary",
+                      np.rint(paycheck[users] * noise).astype(np.int64)))
+    parts.append((users, 0, month_rows(month_index, months, 1), "expense", "Housing", "Rent", rent[users]))
+
+    # Freelance income in about a third of the months
+    freelance = rng.random(len(users)) < 0.3
+    parts.append((users[freelance], 0, month_rows(month_index[freelance], months, rng=rng), "income", "Freelance",
+                  "Freelance Project", cents(rng, 600, 0.6, int(freelance.sum()))))
+
+    # Card purchases: Poisson count per user-month, category by share, log-normal amount per category
+    counts = rng.poisson(expenses_per_month, len(users))
+    purchase_users = np.repeat(users, counts)
+    purchase_months = np.repeat(month_index, counts)
+    shares = np.array([share for _, share, _, _ in EXPENSE_CATEGORIES])
+    category_index = rng.choice(len(EXPENSE_CATEGORIES), size=len(purchase_users), p=shares / shares.sum())
+    medians = np.log([median for _, _, median, _ in EXPENSE_CATEGORIES])
+    sigmas = np.array([sigma for _, _, _, sigma in EXPENSE_CATEGORIES])
+    amounts = np.maximum(np.rint(np.exp(rng.normal(medians[category_index], sigmas[category_index])) * 100), 1)
+    # Mostly from the first account, the rest spread over the others
+    account_index = np.where(rng.random(len(purchase_users)) < 0.7, 0, rng.integers(0, account_count, len(purchase_users)))
+    names = np.array([name for name, _, _, _ in EXPENSE_CATEGORIES], dtype=object)
+    parts.append((purchase_users, account_index, month_rows(purchase_months, months, rng=rng), "expense",
+                  names[category_index], np.char.add(names[category_index].astype(str), " purchase").astype(object),
+                  amounts.astype(np.int64)))
+
+    columns = {key: [] for key in ("user", "account", "date", "type", "category", "description", "amount")}
+    for part_users, part_accounts, dates, transaction_type, category, description, amount in parts:
+        size = len(part_users)
+        columns["user"].append(part_users)
+        columns["account"].append(account_ids[part_users, np.broadcast_to(part_accounts, size)])
+        columns["date"].append(dates)
+        columns["type"].append(np.full(size, transaction_type, dtype=object))
+        columns["category"].append(np.broadcast_to(np.asarray(category, dtype=object), size))
+        columns["description"].append(np.broadcast_to(np.asarray(description, dtype=object), size))
+        columns["amount"].append(np.asarray(amount, dtype=np.int64))
+    columns = {key: np.concatenate(values) for key, values in columns.items()}
+
+    # Nothing after the end date; rows in date order, as they would have been created
+    keep = columns["date"] <= end
+    order = np.argsort(columns["date"][keep], kind="stable")
+    return {key: values[keep][order] for key, values in columns.items()}
+
+def insert_users(db, start: int, count: int, email_prefix: str, hashed_password: str, created_at: datetime):
+    emails = [f"{email_prefix}{index}@example.com" for index in range(start, start + count)]
+    db.execute(insert(DBUser), [
+        {"email": email, "hashed_password": hashed_password, "full_name": f"Synthetic User {start + offset}",
+         "is_active": True, "created_at": created_at}
+        for offset, email in enumerate(emails)
+    ])
+    ids = dict(db.execute(select(DBUser.email, DBUser.id).where(DBUser.email.in_(emails))).all())
+    return np.array([ids[email] for email in emails], dtype=np.int64)
+
+def insert_accounts(rng, db, user_ids: np.ndarray, account_count: int, platform_ids: list, created_at: datetime):
+    platforms = rng.choice(platform_ids, size=(len(user_ids), account_count))
+    numbers = rng.integers(0, 10000, size=(len(user_ids), account_count))
+    db.execute(insert(DBAccount), [
+        {"user_id": int(user_id), "platform_id": int(platforms[row, index]),
+         "account_name": f"{ACCOUNT_TYPES[index % len(ACCOUNT_TYPES)].title()} {index + 1}",
+         "account_type": ACCOUNT_TYPES[index % len(ACCOUNT_TYPES)], "account_number": f"****{numbers[row, index]:04d}",
+         "current_balance": 0.0, "currency": "USD", "is_active": True, "created_at": created_at, "last_updated": created_at}
+        for row, user_id in enumerate(user_ids) for index in range(account_count)
+    ])
+    rows = db.execute(
+        select(DBAccount.user_id, DBAccount.id).where(DBAccount.user_id.in_(user_ids.tolist()))
+        .order_by(DBAccount.user_id, DBAccount.id)
+    ).all()
+    by_user = {}
+    for user_id, account_id in rows:
+        by_user.setdefault(user_id, []).append(account_id)
+    return np.array([by_user[int(user_id)] for user_id in user_ids], dtype=np.int64)
+
+def insert_transactions(db, columns: dict, batch_size: int):
+    keys = ("user_id", "account_id", "transaction_type", "category", "amount", "description", "transaction_date",
+            "created_at")
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite stores DateTime as text; formatting in NumPy skips the per-value bind processing
+        dates = np.char.replace(np.datetime_as_string(columns["date"].astype("datetime64[us]")), "T", " ").tolist()
+        statement = insert(sqlite_transactions_table)
+    else:
+        dates = columns["date"].astype("datetime64[us]").tolist()
+        statement = insert(transactions_table)
+    rows = zip(columns["user"].tolist(), columns["account"].tolist(), columns["type"].tolist(),
+               columns["category"].tolist(), columns["amount"].tolist(), columns["description"].tolist(), dates, dates)
+    batch = []
+    for row in rows:
+        batch.append(dict(zip(keys, row)))
+        if len(batch) >= batch_size:
+            db.execute(statement, batch)
+            batch = []
+    if batch:
+        db.execute(statement, batch)
+
+def set_balances(rng, db, account_ids: np.ndarray, columns: dict):
+    # Opening balance plus the account's net flow, topped up so no account ends below zero
+    flat_ids = account_ids.ravel()
+    position = {account_id: index for index, account_id in enumerate(flat_ids.tolist())}
+    account_index = np.fromiter((position[account_id] for account_id in columns["account"].tolist()),
+                                dtype=np.int64, count=len(columns["account"]))
+    signed = np.where(columns["type"] == "income", columns["amount"], -columns["amount"])
+    net = np.bincount(account_index, weights=signed, minlength=len(flat_ids)).astype(np.int64)
+    balances = cents(rng, 2000, 1.0, len(flat_ids)) + np.maximum(-net, 0) + net
+    db.execute(
+        update(accounts_table).where(accounts_table.c.id == bindparam("account_id"))
+        .values(current_balance=bindparam("balance")),
+        [{"account_id": account_id, "balance": balance} for account_id, balance in zip(flat_ids.tolist(), balances.tolist())]
+    )
+
+def insert_goals(rng, db, user_ids: np.ndarray, end: datetime):
+    goal_counts = rng.integers(0, 4, len(user_ids))
+    goal_users = np.repeat(user_ids, goal_counts)
+    targets = cents(rng, 10000, 0.8, len(goal_users))
+    progress = np.rint(targets * rng.random(len(goal_users))).astype(np.int64)
+    types = rng.integers(0, len(GOAL_TYPES), len(goal_users))
+    priorities = rng.integers(0, len(PRIORITIES), len(goal_users))
+    days = rng.integers(90, 1500, len(goal_users))
+    if len(goal_users):
+        db.execute(insert(goals_table), [
+            {"user_id": user_id, "goal_name": f"{GOAL_TYPES[goal_type].replace('_', ' ').title()} goal",
+             "goal_type": GOAL_TYPES[goal_type], "target_amount": target, "current_amount": current,
+             "target_date": end + timedelta(days=day), "priority": PRIORITIES[priority], "is_active": True,
+             "created_at": end}
+            for user_id, goal_type, target, current, day, priority in zip(
+                goal_users.tolist(), types.tolist(), targets.tolist(), progress.tolist(), days.tolist(), priorities.tolist())
+        ])
+    return len(goal_users)
+
+def generate(users: int = 1000, accounts: int = 3, years: float = 2, seed: int = 42, end_date: datetime = None,
+             expenses_per_month: float = 38, email_prefix: str = "synthetic", password: str = "password123",
+             chunk_users: int = 500, batch_size: int = 20000, verbose: bool = True) -> dict:
+    rng = np.random.default_rng(seed)
+    end = (end_date or datetime.now()).replace(microsecond=0)
+    month_count = max(1, round(years * 12))
+    last_month = np.datetime64(end.strftime("%Y-%m"), "M")
+    months = np.arange(last_month - month_count + 1, last_month + 1)
+    created_at = months[0].astype("datetime64[s]").astype(datetime)
+
+    init_banking_platforms()
+    db = SessionLocal()
+    try:
+        if db.scalar(select(DBUser.id).where(DBUser.email == f"{email_prefix}0@example.com")) is not None:
+            raise ValueError(f"Users with the prefix '{email_prefix}' already exist; choose another --email-prefix")
+        platform_ids = db.scalars(select(DBBankingPlatform.id).order_by(DBBankingPlatform.id)).all()
+        hashed_password = get_password_hash(password)
+        user_ids_all, totals = [], {"transactions": 0, "goals": 0}
+        started = time.perf_counter()
+
+        for start in range(0, users, chunk_users):
+            count = min(chunk_users, users - start)
+            user_ids = insert_users(db, start, count, email_prefix, hashed_password, created_at)
+            account_ids = insert_accounts(rng, db, user_ids, accounts, platform_ids, created_at)
+            columns = generate_transactions(rng, account_ids, months, np.datetime64(end, "s"), expenses_per_month)
+            columns["user"] = user_ids[columns["user"]]
+            insert_transactions(db, columns, batch_size)
+            set_balances(rng, db, account_ids, columns)
+            totals["goals"] += insert_goals(rng, db, user_ids, end)
+            db.commit()
+            user_ids_all.extend(user_ids.tolist())
+            totals["transactions"] += len(columns["amount"])
+            if verbose:
+                elapsed = time.perf_counter() - started
+                print(f"{start + count}/{users} users, {totals['transactions']:,} transactions "
+                      f"({totals['transactions'] / elapsed:,.0f}/s)")
+
+        RollupService.rebuild(db)
+        return {
+            "users": users, "accounts": users * accounts, "transactions": totals["transactions"],
+            "goals": totals["goals"], "user_ids": user_ids_all, "seconds": time.perf_counter() - started,
+        }
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a reproducible synthetic dataset")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--accounts", type=int, default=3, help="accounts per user")
+    parser.add_argument("--years", type=float, default=2, help="history length, ending with --end-date")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=datetime.fromisoformat, default=None, help="default: now")
+    parser.add_argument("--expenses-per-month", type=float, default=38, help="average purchases per user and month")
+    parser.add_argument("--email-prefix", default="synthetic", help="users are <prefix><n>@example.com")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--batch-size", type=int, default=20000, help="rows per INSERT round trip")
+    args = parser.parse_args()
+
+    create_tables()
+    result = generate(args.users, args.accounts, args.years, args.seed, args.end_date, args.expenses_per_month,
+                      args.email_prefix, args.password, batch_size=args.batch_size)
+    print(f"Created {result['users']} users, {result['accounts']} accounts, {result['transactions']:,} transactions "
+          f"and {result['goals']} goals in {result['seconds']:.1f}s")
+
+if __name__ == "__main__":
+    main()
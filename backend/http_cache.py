@@ -0,0 +1,47 @@
+import hashlib
+import os
+from fastapi import Request, Response
+
+from database import data_versions
+
+# Conditional GET helpers: endpoints derive a weak ETag from the user's data version and answer
+# a matching If-None-Match with 304 before doing any work. The version lives in the database
+# (or Redis), so every worker hands out and accepts the same ETags.
+PRIVATE_REVALIDATE = "private, no-cache"
+
+# Platforms are shared and rarely change, so clients and proxies may reuse the list for a while
+PLATFORMS_MAX_AGE_SECONDS = int(os.getenv("PLATFORMS_MAX_AGE_SECONDS", "300"))
+PLATFORMS_CACHE_CONTROL = f"public, max-age={PLATFORMS_MAX_AGE_SECONDS}"
+
+def user_etag(resource: str, user_id: int, variant: str = "") -> str:
+    # Taken before loading, so a write racing the load leaves the response under the older version
+    suffix = f"-{variant}" if variant else ""
+    return f'W/"{resource}-{data_versions.tag(user_id)}{suffix}"'
+
+def query_variant(request: Request) -> str:
+    # Distinguishes pages and filters of the same collection
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    return hashlib.sha1(query.encode()).hexdigest()[:16] if query else ""
+
+def content_etag(resource: str, body: bytes) -> str:
+    return f'W/"{resource}-{hashlib.sha1(body).hexdigest()[:16]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # Weak comparison: W/"x" and "x" match
+    strip = lambda value: value[2:] if value.startswith("W/") else value
+    return "*" in candidates or strip(etag) in (strip(candidate) for candidate in candidates)
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+def set_etag(response: Response, etag: str, cache_control: str = PRIVATE_REVALIDATE):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+def json_response(body: bytes, etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    # body is already-serialized JSON (e.g. from a cache), returned without re-encoding
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": cache_control})
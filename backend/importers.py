@@ -0,0 +1,128 @@
+import csv
+import io
+import re
+from datetime import datetime
+
+# Streaming parsers for bank statement uploads. Each parser reads the file line by line and
+# yields (line number, row) pairs, where row holds the TransactionCreate fields it could find;
+# validation is left to TransactionCreate.
+IMPORT_FORMATS = ("csv", "ofx", "qif")
+
+CSV_COLUMNS = {
+    "transaction_date": ("transaction_date", "date", "posted", "posted_date"),
+    "amount": ("amount",),
+    "transaction_type": ("transaction_type", "type"),
+    "category": ("category",),
+    "description": ("description", "memo", "payee", "name"),
+    "account_id": ("account_id", "account"),
+}
+
+def detect_format(filename: str, requested: str = None) -> str:
+    file_format = (requested or (filename or "").rsplit(".", 1)[-1]).lower()
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format. Use one of: {', '.join(IMPORT_FORMATS)}")
+    return file_format
+
+def text_lines(binary_file):
+    # Decodes the upload incrementally instead of reading it into memory
+    return io.TextIOWrapper(binary_file, encoding="utf-8-sig", errors="replace", newline="")
+
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%d.%m.%Y")
+
+def parse_date(value: str):
+    # ISO 8601 first, then the date-only layouts banks commonly export; unparseable values are
+    # returned as-is so validation reports them
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return value
+
+def signed_row(amount, transaction_type, category, description, transaction_date):
+    # Statements use negative amounts for debits; the API uses a type plus a positive amount
+    try:
+        value = float(str(amount).replace(",", "").replace("$", "").strip())
+    except ValueError:
+        return {"transaction_type": transaction_type, "category": category, "amount": amount,
+                "description": description, "transaction_date": transaction_date}
+    if not transaction_type:
+        transaction_type = "expense" if value < 0 else "income"
+    return {"transaction_type": transaction_type, "category": category or "Uncategorized", "amount": abs(value),
+            "description": description or "", "transaction_date": transaction_date}
+
+def parse_csv(lines):
+    reader = csv.DictReader(lines)
+    fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+    columns = {
+        key: next((fields[alias] for alias in aliases if alias in fields), None)
+        for key, aliases in CSV_COLUMNS.items()
+    }
+    for record in reader:
+        get = lambda key: (record.get(columns[key]) or "").strip() if columns[key] else ""
+        row = signed_row(get("amount"), get("transaction_type").lower(), get("category"),
+                         get("description"), parse_date(get("transaction_date")))
+        if get("account_id"):
+            row["account_id"] = get("account_id")
+        yield reader.line_num, row
+
+OFX_TAG = re.compile(r"<(/?)([A-Z0-9.]+)>([^<\r\n]*)")
+
+def parse_ofx_date(value: str):
+    # YYYYMMDD[HHMMSS[.XXX]][[+-]TZ:NAME]
+    digits = re.match(r"\d+", value.strip())
+    if not digits or len(digits.group()) < 8:
+        return value
+    stamp = digits.group()
+    return datetime.strptime(stamp[:14].ljust(14, "0"), "%Y%m%d%H%M%S")
+
+def parse_ofx(lines):
+    # Handles both SGML (unclosed leaf tags) and XML OFX
+    current = None
+    start = 0
+    for line_number, line in enumerate(lines, 1):
+        for closing, tag, value in OFX_TAG.findall(line):
+            if tag == "STMTTRN":
+                if closing:
+                    if current is not None:
+                        yield start, signed_row(
+                            current.get("TRNAMT", ""), None, None,
+                            " - ".join(part for part in (current.get("NAME"), current.get("MEMO")) if part),
+                            parse_ofx_date(current.get("DTPOSTED", ""))
+                        )
+                    current = None
+                else:
+                    current, start = {}, line_number
+            elif current is not None and not closing and value.strip():
+                current[tag] = value.strip()
+
+def parse_qif(lines):
+    current = {}
+    start = None
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line or line.startswith("!"):
+            continue
+        if line.startswith("^"):
+            if current:
+                yield start, signed_row(
+                    current.get("T", current.get("U", "")), None, current.get("L"),
+                    " - ".join(part for part in (current.get("P"), current.get("M")) if part),
+                    # Quicken writes MM/DD/YYYY, MM/DD/YY or MM/DD'YY
+                    parse_date(current.get("D", "").replace("'", "/").replace(" ", ""))
+                )
+            current, start = {}, None
+            continue
+        if start is None:
+            start = line_number
+        current[line[0]] = line[1:].strip()
+
+PARSERS = {"csv": parse_csv, "ofx": parse_ofx, "qif": parse_qif}
+
+def parse_statement(binary_file, file_format: str):
+    return PARSERS[file_format](text_lines(binary_file))
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from database import SessionLocal, BankingPlatform as DBBankingPlatform, User as DBUser, Account as DBAccount, Transaction as DBTransaction, FinancialGoal as DBFinancialGoal
+from database import SessionLocal, create_tables, BankingPlatform as DBBankingPlatform, User as DBUser, Account as DBAccount, Transaction as DBTransaction, FinancialGoal as DBFinancialGoal
 from auth import get_password_hash
+from services import RollupService
 from datetime import datetime, timedelta
 import random
 
@@ -225,6 +226,7 @@ def create_demo_data():
     db.add_all([emergency_goal, vacation_goal])
     
     db.commit()
+    RollupService.rebuild(db, user.id)
     print(f"Created 3 demo accounts")
     print(f"Created {transactions_created} demo transactions")
     print(f"Created 2 demo financial goals")
@@ -232,6 +234,7 @@ def create_demo_data():
 
 if __name__ == "__main__":
     print("Initializing database with sample data...")
+    create_tables()
     init_banking_platforms()
     create_test_user()
     create_demo_data()
@@ -1,14 +1,22 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, UploadFile, File, status
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from datetime import timedelta
+from datetime import datetime, timedelta
 import uvicorn
 
-from database import get_db, create_tables
+from database import get_db, create_tables, ASYNC_DB_ENABLED
 from models import *
-from auth import authenticate_user, create_access_token, get_current_active_user, ACCESS_TOKEN_EXPIRE_MINUTES
+from auth import authenticate_user_async, get_password_hash_async, password_hash_stats, create_access_token, get_current_active_user, \
+    get_read_db, ACCESS_TOKEN_EXPIRE_MINUTES
 from services import *
+from importers import detect_format, parse_statement
+from exporters import EXPORT_FORMATS, PARQUET_AVAILABLE, encode_export
+import analytics_engine
+from http_cache import etag_matches, not_modified, json_response, set_etag, user_etag, query_variant, \
+    PLATFORMS_CACHE_CONTROL
 
 # Create FastAPI app
 app = FastAPI(
@@ -24,27 +32,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Async read endpoints (ASYNC_DB=true) are registered first so they shadow the sync ones below
+if ASYNC_DB_ENABLED:
+    from async_api import router as async_router
+    app.include_router(async_router)
+
 # Create database tables on startup
 @app.on_event("startup")
 def startup_event():
     create_tables()
 
 # Authentication endpoints
+# Password hashing runs in the bounded executor from auth.py; DB calls go to the threadpool
 @app.post("/api/register", response_model=User)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = UserService.get_user_by_email(db, email=user.email)
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(UserService.get_user_by_email, db, user.email)
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
-    return UserService.create_user(db=db, user=user)
+    hashed_password = await get_password_hash_async(user.password)
+    return await run_in_threadpool(UserService.create_user, db, user, hashed_password)
 
 @app.post("/api/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,7 +69,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
         )
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "uid": user.id}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -70,9 +86,13 @@ def create_platform(
 ):
     return BankingPlatformService.create_platform(db=db, platform=platform)
 
+# The same for every user and rarely changed: cacheable by clients for PLATFORMS_MAX_AGE_SECONDS
 @app.get("/api/platforms", response_model=List[BankingPlatform])
-def get_platforms(db: Session = Depends(get_db)):
-    return BankingPlatformService.get_platforms(db)
+def get_platforms(request: Request, db: Session = Depends(get_db)):
+    etag, body = BankingPlatformService.get_platforms_json(db)
+    if etag_matches(request, etag):
+        return not_modified(etag, PLATFORMS_CACHE_CONTROL)
+    return json_response(body, etag, PLATFORMS_CACHE_CONTROL)
 
 # Account endpoints
 @app.post("/api/accounts", response_model=Account)
@@ -83,11 +103,26 @@ def create_account(
 ):
     return AccountService.create_account(db=db, account=account, user_id=current_user.id)
 
+# Applies a list of operations in one DB transaction and reports the outcome of each
+@app.post("/api/accounts/batch", response_model=BatchResult)
+def batch_accounts(
+    batch: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return AccountService.run_batch(db, current_user.id, batch.operations)
+
 @app.get("/api/accounts", response_model=List[Account])
 def get_accounts(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
+    etag = user_etag("accounts", current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return AccountService.get_user_accounts(db, current_user.id)
 
 @app.put("/api/accounts/{account_id}/balance")
@@ -127,13 +162,104 @@ def create_transaction(
 ):
     return TransactionService.create_transaction(db=db, transaction=transaction, user_id=current_user.id)
 
+# Applies a list of create operations in one DB transaction and reports the outcome of each;
+# transactions are never updated or deleted, so other actions fail per item with 400
+@app.post("/api/transactions/batch", response_model=BatchResult)
+def batch_transactions(
+    batch: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return TransactionService.run_batch(db, current_user.id, batch.operations)
+
+# Bulk import of a CSV, OFX or QIF statement; the format comes from the file extension unless given
+@app.post("/api/transactions/import", response_model=ImportResult)
+def import_transactions(
+    file: UploadFile = File(...),
+    account_id: Optional[int] = None,
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    try:
+        file_format = detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = parse_statement(file.file, file_format)
+    return TransactionService.import_transactions(db, current_user.id, rows, default_account_id=account_id)
+
 @app.get("/api/transactions", response_model=List[Transaction])
 def get_transactions(
+    request: Request,
+    response: Response,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    account_id: Optional[int] = None,
+    category: Optional[str] = None,
+    transaction_type: Optional[TransactionType] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    etag = user_etag("transactions", current_user.id, query_variant(request))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    # The cursor for the next page, if any, is returned in the X-Next-Cursor header
+    transactions, next_cursor = TransactionService.get_transactions_page(
+        db, current_user.id, max(1, min(limit, 500)), cursor,
+        account_id=account_id, category=category, transaction_type=transaction_type,
+        start_date=start_date, end_date=end_date
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return transactions
+
+# Streams the full (optionally filtered) history as CSV, NDJSON or Parquet
+@app.get("/api/transactions/export")
+def export_transactions(
+    format: str = "csv",
+    account_id: Optional[int] = None,
+    category: Optional[str] = None,
+    transaction_type: Optional[TransactionType] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}")
+    if format == "parquet" and not PARQUET_AVAILABLE:
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow to be installed")
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    chunks = TransactionService.export_chunks(
+        current_user.id, account_id=account_id, category=category, transaction_type=transaction_type,
+        start_date=start_date, end_date=end_date
+    )
+    filename = f"transactions-{datetime.utcnow():%Y%m%d}.{extension}"
+    return StreamingResponse(
+        encode_export(chunks, format), media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/transactions/compact", response_model=TransactionPage)
+def get_compact_transactions(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    account_id: Optional[int] = None,
+    category: Optional[str] = None,
+    transaction_type: Optional[TransactionType] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    return TransactionService.get_user_transactions(db, current_user.id, limit)
+    return TransactionService.get_compact_transactions_page(
+        db, current_user.id, max(1, min(limit, 500)), cursor,
+        account_id=account_id, category=category, transaction_type=transaction_type,
+        start_date=start_date, end_date=end_date
+    )
 
 # Financial Goals endpoints
 @app.post("/api/goals", response_model=FinancialGoal)
@@ -144,11 +270,26 @@ def create_goal(
 ):
     return FinancialGoalService.create_goal(db=db, goal=goal, user_id=current_user.id)
 
+# Applies a list of operations in one DB transaction and reports the outcome of each
+@app.post("/api/goals/batch", response_model=BatchResult)
+def batch_goals(
+    batch: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return FinancialGoalService.run_batch(db, current_user.id, batch.operations)
+
 @app.get("/api/goals", response_model=List[FinancialGoal])
 def get_goals(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
+    etag = user_etag("goals", current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return FinancialGoalService.get_user_goals(db, current_user.id)
 
 @app.put("/api/goals/{goal_id}/progress")
@@ -180,21 +321,84 @@ def delete_goal(
     return FinancialGoalService.delete_goal(db, goal_id, current_user.id)
 
 # Analytics endpoints
+# Cached per user until their data changes; a matching If-None-Match gets a 304 without a query
 @app.get("/api/analytics/overview", response_model=FinancialOverview)
 def get_financial_overview(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    etag = FinancialAnalyticsService.overview_etag(current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return json_response(FinancialAnalyticsService.get_overview_json(db, current_user.id, etag), etag)
+
+# Financial health score and recommendations, cached per user until their data changes
+@app.get("/api/analytics/health", response_model=FinancialHealth)
+def get_financial_health(
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    return FinancialAnalyticsService.get_financial_overview(db, current_user.id)
+    return FinancialHealthService.get_health(db, current_user.id)
 
 @app.get("/api/analytics/monthly/{year}/{month}")
 def get_monthly_metrics(
+    year: int,
+    month: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return FinancialAnalyticsService.calculate_monthly_metrics(db, current_user.id, month, year, include_daily=True)
+
+@app.get("/api/analytics/history")
+def get_monthly_history(
+    months: int = 12,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    return FinancialAnalyticsService.get_monthly_history(db, current_user.id, max(1, min(months, 120)))
+
+# Monthly series ending with year/month (default: the current month), with `window`-month rolling averages
+@app.get("/api/analytics/trends", response_model=AnalyticsTrends)
+def get_trends(
+    months: int = 12,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    window: int = 3,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    now = FinancialAnalyticsService.now()
+    return analytics_engine.monthly_trends(
+        db, current_user.id, year or now.year, month or now.month,
+        max(1, min(months, 120)), max(1, min(window, 12))
+    )
+
+# Category breakdown for year/month, or for [start_date, end_date) (default: the current month)
+@app.get("/api/analytics/categories", response_model=CategoryBreakdown)
+def get_category_breakdown(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: TransactionType = TransactionType.EXPENSE,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    if start_date is None or end_date is None:
+        now = FinancialAnalyticsService.now()
+        start_date = analytics_engine.month_start(year or now.year, month or now.month)
+        end_date = analytics_engine.month_start(start_date.year, start_date.month + 1)
+    return analytics_engine.category_breakdown(db, current_user.id, start_date, end_date, transaction_type.value)
+
+@app.post("/api/analytics/monthly/{year}/{month}/materialize", response_model=List[FinancialMetric])
+def materialize_monthly_metrics(
     year: int,
     month: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    return FinancialAnalyticsService.calculate_monthly_metrics(db, current_user.id, month, year)
+    return FinancialAnalyticsService.materialize_monthly_metrics(db, current_user.id, month, year)
 
 # AI Assistant endpoints
 @app.post("/api/ai/advice", response_model=AIResponse)
@@ -205,10 +409,24 @@ async def get_financial_advice(
 ):
     return await AIAssistantService.get_financial_advice(db, current_user.id, query.query)
 
+# Streams the advice as Server-Sent Events ("token" events, then a final "done" event)
+@app.post("/api/ai/advice/stream")
+async def stream_financial_advice(
+    query: AIQuery,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    events = await AIAssistantService.get_advice_stream(db, current_user.id, query.query)
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+
 # Health check
 @app.get("/api/health")
 def health_check():
-    return {"status": "healthy", "message": "Personal Finance API is running"}
+    return {
+        "status": "healthy",
+        "message": "Personal Finance API is running",
+        "password_hashing": password_hash_stats()
+    }
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,131 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Schema as created by Base.metadata.create_all() before migrations were introduced.
+Existing databases without an alembic_version table are stamped at this revision.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('banking_platforms',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('platform_type', sa.String(), nullable=True),
+    sa.Column('logo_url', sa.String(), nullable=True),
+    sa.Column('api_endpoint', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_banking_platforms_id', 'banking_platforms', ['id'], unique=False)
+    op.create_index('ix_banking_platforms_name', 'banking_platforms', ['name'], unique=True)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=True),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+
+    op.create_table('accounts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('platform_id', sa.Integer(), nullable=True),
+    sa.Column('account_name', sa.String(), nullable=True),
+    sa.Column('account_type', sa.String(), nullable=True),
+    sa.Column('account_number', sa.String(), nullable=True),
+    sa.Column('current_balance', sa.Float(), nullable=True),
+    sa.Column('currency', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_updated', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['platform_id'], ['banking_platforms.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_accounts_id', 'accounts', ['id'], unique=False)
+
+    op.create_table('financial_goals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('goal_name', sa.String(), nullable=True),
+    sa.Column('goal_type', sa.String(), nullable=True),
+    sa.Column('target_amount', sa.Float(), nullable=True),
+    sa.Column('current_amount', sa.Float(), nullable=True),
+    sa.Column('target_date', sa.DateTime(), nullable=True),
+    sa.Column('priority', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_financial_goals_id', 'financial_goals', ['id'], unique=False)
+
+    op.create_table('financial_metrics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('metric_name', sa.String(), nullable=True),
+    sa.Column('metric_value', sa.Float(), nullable=True),
+    sa.Column('metric_type', sa.String(), nullable=True),
+    sa.Column('calculation_date', sa.DateTime(), nullable=True),
+    sa.Column('period_start', sa.DateTime(), nullable=True),
+    sa.Column('period_end', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_financial_metrics_id', 'financial_metrics', ['id'], unique=False)
+
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('account_id', sa.Integer(), nullable=True),
+    sa.Column('transaction_type', sa.String(), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('transaction_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_id', 'transactions', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_id', table_name='transactions')
+    op.drop_table('transactions')
+
+    op.drop_index('ix_financial_metrics_id', table_name='financial_metrics')
+    op.drop_table('financial_metrics')
+
+    op.drop_index('ix_financial_goals_id', table_name='financial_goals')
+    op.drop_table('financial_goals')
+
+    op.drop_index('ix_accounts_id', table_name='accounts')
+    op.drop_table('accounts')
+
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+
+    op.drop_index('ix_banking_platforms_name', table_name='banking_platforms')
+    op.drop_index('ix_banking_platforms_id', table_name='banking_platforms')
+    op.drop_table('banking_platforms')
@@ -0,0 +1,34 @@
+"""composite indexes for per-user queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+Covers the transaction history (user_id + transaction_date ordering), the
+monthly period aggregates (user_id + transaction_type + date range) and the
+active account/goal listings.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_transactions_user_date', 'transactions', ['user_id', 'transaction_date'], unique=False, if_not_exists=True)
+    op.create_index('ix_transactions_user_type_date', 'transactions', ['user_id', 'transaction_type', 'transaction_date'], unique=False, if_not_exists=True)
+    op.create_index('ix_accounts_user_active', 'accounts', ['user_id', 'is_active'], unique=False, if_not_exists=True)
+    op.create_index('ix_financial_goals_user_active', 'financial_goals', ['user_id', 'is_active'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_financial_goals_user_active', table_name='financial_goals')
+    op.drop_index('ix_accounts_user_active', table_name='accounts')
+    op.drop_index('ix_transactions_user_type_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_date', table_name='transactions')
@@ -0,0 +1,32 @@
+"""one financial metric row per user, type and period
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+Metrics used to be appended on every overview read. Keep the newest row of
+each (user_id, metric_type, period_start) group and enforce uniqueness so
+materialization can upsert.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM financial_metrics WHERE id NOT IN ("
+        "SELECT MAX(id) FROM financial_metrics GROUP BY user_id, metric_type, period_start)"
+    )
+    op.create_index('uq_financial_metrics_user_type_period', 'financial_metrics', ['user_id', 'metric_type', 'period_start'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_financial_metrics_user_type_period', table_name='financial_metrics')
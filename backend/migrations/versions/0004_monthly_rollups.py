@@ -0,0 +1,59 @@
+"""monthly rollup table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+Per (user, year, month, transaction_type, category) sums and counts, filled
+from the existing transactions.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    rollups = op.create_table('monthly_rollups',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('transaction_type', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=True),
+    sa.Column('transaction_count', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'year', 'month', 'transaction_type', 'category')
+    )
+
+    transactions = sa.table('transactions',
+        sa.column('user_id', sa.Integer()),
+        sa.column('transaction_type', sa.String()),
+        sa.column('category', sa.String()),
+        sa.column('amount', sa.Float()),
+        sa.column('transaction_date', sa.DateTime()),
+    )
+    year = sa.extract('year', transactions.c.transaction_date)
+    month = sa.extract('month', transactions.c.transaction_date)
+    category = sa.func.coalesce(transactions.c.category, '')
+    op.execute(rollups.insert().from_select(
+        ['user_id', 'year', 'month', 'transaction_type', 'category', 'total_amount', 'transaction_count'],
+        sa.select(
+            transactions.c.user_id, year, month, transactions.c.transaction_type, category,
+            sa.func.sum(transactions.c.amount), sa.func.count()
+        ).where(
+            transactions.c.user_id.isnot(None),
+            transactions.c.transaction_type.isnot(None),
+            transactions.c.transaction_date.isnot(None),
+        ).group_by(transactions.c.user_id, year, month, transactions.c.transaction_type, category)
+    ))
+
+
+def downgrade() -> None:
+    op.drop_table('monthly_rollups')
@@ -0,0 +1,29 @@
+"""indexes for filtered transaction listings
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+Lets the paginated /api/transactions filters by account and category walk
+an index in (transaction_date, id) order.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_transactions_user_account_date', 'transactions', ['user_id', 'account_id', 'transaction_date'], unique=False, if_not_exists=True)
+    op.create_index('ix_transactions_user_category_date', 'transactions', ['user_id', 'category', 'transaction_date'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_user_category_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_account_date', table_name='transactions')
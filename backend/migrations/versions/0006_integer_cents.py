@@ -0,0 +1,85 @@
+"""store currency amounts as integer cents
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+Converts account balances, transaction amounts, goal amounts and rollup totals
+from floating-point dollars to BIGINT cents (database.Money), rounding each
+value to the nearest cent. Rollup totals are sums, so they are rebuilt from
+the converted transaction cents (as RollupService.rebuild does) rather than
+rounded, which could leave them a cent off the transactions they summarise.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+MONEY_COLUMNS = [
+    ('accounts', 'current_balance'),
+    ('transactions', 'amount'),
+    ('financial_goals', 'target_amount'),
+    ('financial_goals', 'current_amount'),
+]
+
+
+def upgrade() -> None:
+    for table, column in MONEY_COLUMNS:
+        op.execute(f'UPDATE {table} SET {column} = ROUND({column} * 100) WHERE {column} IS NOT NULL')
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.Float(), type_=sa.BigInteger(),
+                                  postgresql_using=f'{column}::bigint')
+
+    with op.batch_alter_table('monthly_rollups') as batch_op:
+        batch_op.alter_column('total_amount', existing_type=sa.Float(), type_=sa.BigInteger(),
+                              postgresql_using='total_amount::bigint')
+    rebuild_rollups()
+
+
+def rebuild_rollups() -> None:
+    rollups = sa.table('monthly_rollups',
+        sa.column('user_id', sa.Integer()),
+        sa.column('year', sa.Integer()),
+        sa.column('month', sa.Integer()),
+        sa.column('transaction_type', sa.String()),
+        sa.column('category', sa.String()),
+        sa.column('total_amount', sa.BigInteger()),
+        sa.column('transaction_count', sa.Integer()),
+    )
+    transactions = sa.table('transactions',
+        sa.column('id', sa.Integer()),
+        sa.column('user_id', sa.Integer()),
+        sa.column('transaction_type', sa.String()),
+        sa.column('category', sa.String()),
+        sa.column('amount', sa.BigInteger()),
+        sa.column('transaction_date', sa.DateTime()),
+    )
+    year = sa.extract('year', transactions.c.transaction_date)
+    month = sa.extract('month', transactions.c.transaction_date)
+    category = sa.func.coalesce(transactions.c.category, '')
+    op.execute(rollups.delete())
+    op.execute(rollups.insert().from_select(
+        ['user_id', 'year', 'month', 'transaction_type', 'category', 'total_amount', 'transaction_count'],
+        sa.select(
+            transactions.c.user_id, year, month, transactions.c.transaction_type, category,
+            sa.func.sum(transactions.c.amount), sa.func.count(transactions.c.id)
+        ).where(
+            transactions.c.user_id.isnot(None),
+            transactions.c.transaction_type.isnot(None),
+            transactions.c.transaction_date.isnot(None),
+        ).group_by(transactions.c.user_id, year, month, transactions.c.transaction_type, category)
+    ))
+
+
+def downgrade() -> None:
+    for table, column in MONEY_COLUMNS + [('monthly_rollups', 'total_amount')]:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.BigInteger(), type_=sa.Float(),
+                                  postgresql_using=f'{column}::double precision')
+        op.execute(f'UPDATE {table} SET {column} = {column} / 100.0 WHERE {column} IS NOT NULL')
@@ -0,0 +1,32 @@
+"""per-user data version
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+Adds users.data_version (bumped after every write to the user's accounts,
+transactions or goals) and users.data_written_at, so ETags, version-keyed
+caches and read-your-writes routing agree across worker processes.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('data_written_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('data_written_at')
+        batch_op.drop_column('data_version')
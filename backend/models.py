@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -115,6 +115,15 @@ class TransactionCreate(TransactionBase):
             raise ValueError('No es posible agregar la transacción en una fecha futura')
         return v
 
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+
 class Transaction(TransactionBase):
     id: int
     user_id: int
@@ -125,6 +134,34 @@ class Transaction(TransactionBase):
     class Config:
         from_attributes = True
 
+# Compact transaction listing: accounts and platforms are side-loaded once per page
+class TransactionCompact(TransactionBase):
+    id: int
+    account_id: int
+    created_at: datetime
+
+class AccountRef(BaseModel):
+    id: int
+    platform_id: int
+    account_name: str
+    account_type: str
+    account_number: str
+    current_balance: float
+    currency: str
+    is_active: bool
+
+class PlatformRef(BaseModel):
+    id: int
+    name: str
+    platform_type: str
+    logo_url: Optional[str] = None
+
+class TransactionPage(BaseModel):
+    transactions: List[TransactionCompact]
+    accounts: Dict[int, AccountRef]
+    platforms: Dict[int, PlatformRef]
+    next_cursor: Optional[str] = None
+
 # Financial Goal models
 class FinancialGoalBase(BaseModel):
     goal_name: str
@@ -187,6 +224,54 @@ class FinancialOverview(BaseModel):
     recent_transactions: List[Transaction]
     active_goals: List[FinancialGoal]
 
+# Vectorized analytics: parallel arrays, one entry per month / category
+class AnalyticsTrends(BaseModel):
+    months: List[str]
+    income: List[float]
+    expenses: List[float]
+    net: List[float]
+    savings_rate: List[float]
+    rolling_income: List[float]
+    rolling_expenses: List[float]
+    daily_average_expenses: List[float]
+    largest_expense: List[float]
+    # Percentiles of individual expense amounts over the whole period (p50, p75, p90, p95)
+    expense_percentiles: Dict[str, float]
+
+class CategoryBreakdown(BaseModel):
+    transaction_type: TransactionType
+    start_date: datetime
+    end_date: datetime
+    categories: List[str]
+    totals: List[float]
+    counts: List[int]
+    shares: List[float]
+    median: List[float]
+    p90: List[float]
+
+class FinancialSnapshot(BaseModel):
+    total_balance: float
+    monthly_income: float
+    monthly_expenses: float
+    savings_rate: float
+    account_count: int
+    platform_count: int
+    account_type_count: int
+    active_goals: List[FinancialGoal]
+
+class FinancialHealth(BaseModel):
+    score: int
+    rating: str
+    savings_rate: float
+    # Expenses as a percentage of income; None without income this month
+    expense_ratio: Optional[float]
+    # Average progress of the active goals, in percent
+    goal_progress: float
+    account_type_count: int
+    # Points contributed by each factor on top of the base score of 50
+    components: Dict[str, float]
+    recommendations: List[str]
+
 # AI Assistant models
 class AIQuery(BaseModel):
     query: str
@@ -197,6 +282,33 @@ class AIResponse(BaseModel):
     recommendations: List[str]
     confidence: float
 
+# Batch models
+class BatchAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class BatchOperation(BaseModel):
+    action: BatchAction = BatchAction.CREATE
+    id: Optional[int] = None
+    # Create/update payload, validated per item so one bad item does not reject the whole batch
+    data: Dict = {}
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+
+class BatchItemResult(BaseModel):
+    index: int
+    success: bool
+    id: Optional[int] = None
+    status_code: int = 200
+    error: Optional[str] = None
+
+class BatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+
 # Token model
 class Token(BaseModel):
     access_token: str
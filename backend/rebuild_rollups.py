@@ -0,0 +1,25 @@
+# Recomputes the monthly_rollups table from the transactions table.
+# Usage: python rebuild_rollups.py [user_email]
+import sys
+
+from database import SessionLocal, create_tables, User as DBUser
+from services import RollupService
+
+def rebuild_rollups(email=None):
+    db = SessionLocal()
+    try:
+        user_id = None
+        if email:
+            user = db.query(DBUser).filter(DBUser.email == email).first()
+            if not user:
+                print(f"User {email} not found.")
+                return
+            user_id = user.id
+        RollupService.rebuild(db, user_id)
+        print(f"Rebuilt monthly rollups for {email or 'all users'}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    create_tables()
+    rebuild_rollups(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -1,23 +1,42 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
-from database import User as DBUser, Account as DBAccount, Transaction as DBTransaction, FinancialGoal as DBFinancialGoal, FinancialMetric as DBFinancialMetric, BankingPlatform as DBBankingPlatform
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, and_, or_, extract, select, insert, update
+from database import read_session, dialect_insert, data_versions, to_cents, from_cents, User as DBUser, Account as DBAccount, Transaction as DBTransaction, FinancialGoal as DBFinancialGoal, FinancialMetric as DBFinancialMetric, BankingPlatform as DBBankingPlatform, MonthlyRollup as DBMonthlyRollup
 from models import *
 from auth import get_password_hash
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from fastapi import HTTPException
+from cache import TTLCache, shared_cache
+from http_cache import user_etag, content_etag
+from ai_providers import get_provider, split_chunks, AI_TIMEOUT_SECONDS, AI_CACHE_TTL_SECONDS, AI_CACHE_SIZE
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
 # import pandas as pd  # Commented out temporarily
 # import openai  # Commented out temporarily
 import os
+import json
+import base64
+import asyncio
+import hashlib
 from dotenv import load_dotenv
 
 load_dotenv()
+
+def format_validation_error(error: Exception) -> str:
+    # One line per failing field, for per-item errors in imports and batches
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+        )
+    return str(error)
+
 # openai.api_key = os.getenv("OPENAI_API_KEY")  # Commented out temporarily
 
 class UserService:
     @staticmethod
-    def create_user(db: Session, user: UserCreate):
-        hashed_password = get_password_hash(user.password)
+    def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None):
+        if hashed_password is None:
+            hashed_password = get_password_hash(user.password)
         db_user = DBUser(
             email=user.email,
             hashed_password=hashed_password,
@@ -33,32 +52,98 @@ class UserService:
         return db.query(DBUser).filter(DBUser.email == email).first()
 
 class BankingPlatformService:
+    # The serialized active-platform list and its ETag. create_platform clears it; the TTL bounds
+    # staleness in other workers and after changes made outside the API.
+    list_cache = TTLCache(maxsize=1, ttl=float(os.getenv("PLATFORMS_CACHE_TTL_SECONDS", "60")))
+
     @staticmethod
     def create_platform(db: Session, platform: BankingPlatformCreate):
         db_platform = DBBankingPlatform(**platform.dict())
         db.add(db_platform)
         db.commit()
         db.refresh(db_platform)
+        BankingPlatformService.list_cache.clear()
         return db_platform
 
     @staticmethod
     def get_platforms(db: Session):
         return db.query(DBBankingPlatform).filter(DBBankingPlatform.is_active == True).all()
 
+    @staticmethod
+    def get_platforms_json(db: Session):
+        # (etag, body); only a cache miss queries
+        entry = BankingPlatformService.list_cache.get("active")
+        if entry is None:
+            platforms = BankingPlatformService.get_platforms(db)
+            body = json.dumps(
+                [BankingPlatform.model_validate(platform).model_dump(mode="json") for platform in platforms]
+            ).encode()
+            entry = (content_etag("platforms", body), body)
+            BankingPlatformService.list_cache.set("active", entry)
+        return entry
+
 class AccountService:
     @staticmethod
     def create_account(db: Session, account: AccountCreate, user_id: int):
         db_account = DBAccount(**account.dict(), user_id=user_id)
         db.add(db_account)
         db.commit()
+        data_versions.bump(user_id)
         db.refresh(db_account)
         return db_account
 
+    # Statement builders are shared with the AsyncSession services in async_services.py
     @staticmethod
-    def get_user_accounts(db: Session, user_id: int):
-        return db.query(DBAccount).filter(
+    def user_accounts_query(user_id: int):
+        return select(DBAccount).options(joinedload(DBAccount.platform)).where(
             and_(DBAccount.user_id == user_id, DBAccount.is_active == True)
-        ).all()
+        )
+
+    @staticmethod
+    def balance_update(user_id: int, account_id: int, delta: float):
+        # Adds `delta` to the balance in the database. Withdrawals only match while the balance
+        # covers them, so a rowcount of 0 means missing or deleted account, wrong owner or
+        # insufficient funds.
+        statement = update(DBAccount)\
+            .where(DBAccount.id == account_id, DBAccount.user_id == user_id, DBAccount.is_active == True)\
+            .values(current_balance=DBAccount.current_balance + delta, last_updated=datetime.utcnow())\
+            .execution_options(synchronize_session=False)
+        if delta < 0:
+            statement = statement.where(DBAccount.current_balance >= -delta)
+        return statement
+
+    @staticmethod
+    def raise_balance_update_error(db: Session, user_id: int, account_id: int, amount: float):
+        # Explains a balance_update that matched no row; the caller rolls back. FOR UPDATE (Postgres) reads the committed
+        # balance without racing a concurrent writer; SQLite ignores it.
+        account = db.scalars(
+            select(DBAccount).where(DBAccount.id == account_id).with_for_update()
+        ).first()
+        # Deleted (inactive) accounts cannot take new transactions
+        if not account or not account.is_active:
+            raise HTTPException(status_code=404, detail="Account not found")
+        
+        # Verify account belongs to user
+        if account.user_id != user_id:
+            raise HTTPException(status_code=403, detail="You don't have permission to use this account")
+        
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Insufficient balance. Available: ${account.current_balance:.2f}, Required: ${amount:.2f}"
+        )
+
+    @staticmethod
+    def balance_summary_query(user_id: int):
+        return select(
+            func.coalesce(func.sum(DBAccount.current_balance), 0.0).label("total_balance"),
+            func.count(DBAccount.id).label("account_count"),
+            func.count(func.distinct(DBAccount.platform_id)).label("platform_count"),
+            func.count(func.distinct(DBAccount.account_type)).label("account_type_count")
+        ).where(and_(DBAccount.user_id == user_id, DBAccount.is_active == True))
+
+    @staticmethod
+    def get_user_accounts(db: Session, user_id: int):
+        return db.scalars(AccountService.user_accounts_query(user_id)).all()
 
     @staticmethod
     def update_account_balance(db: Session, account_id: int, new_balance: float, user_id: int):
@@ -69,6 +154,7 @@ class AccountService:
             account.current_balance = new_balance
             account.last_updated = datetime.utcnow()
             db.commit()
+            data_versions.bump(user_id)
             db.refresh(account)
         return account
 
@@ -82,9 +168,34 @@ class AccountService:
                 setattr(account, key, value)
             account.last_updated = datetime.utcnow()
             db.commit()
+            data_versions.bump(user_id)
             db.refresh(account)
         return account
 
+    @staticmethod
+    def run_batch(db: Session, user_id: int, operations: List[BatchOperation]) -> BatchResult:
+        def apply(operation: BatchOperation):
+            if operation.action == BatchAction.CREATE:
+                account = DBAccount(**AccountCreate(**operation.data).dict(), user_id=user_id)
+                db.add(account)
+                db.flush()
+                return account.id
+            
+            account = db.scalars(select(DBAccount).where(
+                and_(DBAccount.id == operation.id, DBAccount.user_id == user_id)
+            )).first()
+            if not account:
+                raise HTTPException(status_code=404, detail="Account not found")
+            if operation.action == BatchAction.UPDATE:
+                for key, value in AccountUpdate(**operation.data).dict(exclude_unset=True).items():
+                    setattr(account, key, value)
+                account.last_updated = datetime.utcnow()
+            else:
+                account.is_active = False
+            return account.id
+
+        return BatchService.run(db, user_id, operations, apply)
+
     @staticmethod
     def delete_account(db: Session, account_id: int, user_id: int):
         account = db.query(DBAccount).filter(
@@ -93,48 +204,353 @@ class AccountService:
         if account:
             account.is_active = False
             db.commit()
+            data_versions.bump(user_id)
         return {"message": "Account deleted successfully"}
 
 class TransactionService:
+    # Responses nest account -> platform; load them in one extra query instead of one per row
+    ACCOUNT_LOADER = selectinload(DBTransaction.account).joinedload(DBAccount.platform)
+
     @staticmethod
     def create_transaction(db: Session, transaction: TransactionCreate, user_id: int):
         # Validate transaction date is not in the future
         if transaction.transaction_date > datetime.utcnow():
             raise HTTPException(status_code=400, detail="No es posible agregar la transacción en una fecha futura")
         
-        db_transaction = DBTransaction(**transaction.dict(), user_id=user_id)
-        db.add(db_transaction)
-        
-        # Update account balance
-        account = db.query(DBAccount).filter(DBAccount.id == transaction.account_id).first()
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-        
-        # Verify account belongs to user
-        if account.user_id != user_id:
-            raise HTTPException(status_code=403, detail="You don't have permission to use this account")
-        
-        # Check sufficient balance for expenses
-        if transaction.transaction_type == TransactionType.EXPENSE:
-            if account.current_balance < transaction.amount:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Insufficient balance. Available: ${account.current_balance:.2f}, Required: ${transaction.amount:.2f}"
-                )
-            account.current_balance -= transaction.amount
-        elif transaction.transaction_type == TransactionType.INCOME:
-            account.current_balance += transaction.amount
-        
-        account.last_updated = datetime.utcnow()
+        try:
+            db_transaction = TransactionService.add_transaction(db, transaction, user_id)
+        except HTTPException:
+            db.rollback()
+            raise
+        RollupService.record(db, user_id, [db_transaction])
         
         db.commit()
+        data_versions.bump(user_id)
         db.refresh(db_transaction)
         return db_transaction
 
+    @staticmethod
+    def add_transaction(db: Session, transaction: TransactionCreate, user_id: int):
+        # Applies the balance change first, in one conditional UPDATE, so concurrent
+        # transactions on the same account can neither lose updates nor overdraw it.
+        # Runs inside the caller's DB transaction; the caller records rollups and commits.
+        delta = TransactionService.balance_delta(transaction.transaction_type, transaction.amount)
+        result = db.execute(AccountService.balance_update(user_id, transaction.account_id, delta))
+        if result.rowcount != 1:
+            AccountService.raise_balance_update_error(db, user_id, transaction.account_id, transaction.amount)
+        
+        db_transaction = DBTransaction(**transaction.dict(), user_id=user_id)
+        db.add(db_transaction)
+        return db_transaction
+
+    @staticmethod
+    def run_batch(db: Session, user_id: int, operations: List[BatchOperation]) -> BatchResult:
+        created = []
+
+        def apply(operation: BatchOperation):
+            if operation.action != BatchAction.CREATE:
+                raise HTTPException(status_code=400, detail="Transactions only support the create action")
+            db_transaction = TransactionService.add_transaction(db, TransactionCreate(**operation.data), user_id)
+            db.flush()
+            created.append(db_transaction)
+            return db_transaction.id
+
+        # Rollups for all created transactions are written in one upsert before the commit
+        return BatchService.run(db, user_id, operations, apply, before_commit=lambda: RollupService.record(db, user_id, created))
+
+    # Rows per INSERT batch for bulk imports; each batch commits on its own
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    # Per-row errors returned by an import (the failed count covers all of them)
+    IMPORT_MAX_ERRORS = 100
+
+    @staticmethod
+    def import_transactions(db: Session, user_id: int, rows, default_account_id: Optional[int] = None) -> ImportResult:
+        # rows yields (line number, dict of TransactionCreate fields), e.g. from importers.parse_statement
+        owned_accounts = set(db.scalars(
+            select(DBAccount.id).where(DBAccount.user_id == user_id, DBAccount.is_active == True)
+        ))
+        result = ImportResult(imported=0, failed=0, errors=[])
+
+        def fail(row_number, error):
+            result.failed += 1
+            result.errors.append(ImportRowError(row=row_number, error=error))
+            if len(result.errors) > TransactionService.IMPORT_MAX_ERRORS:
+                # Keep the errors for the first rows of the file
+                result.errors.remove(max(result.errors, key=lambda item: item.row))
+
+        batch = []
+        for row_number, row in rows:
+            row.setdefault("account_id", default_account_id)
+            try:
+                transaction = TransactionCreate(**row)
+            except (ValidationError, TypeError, ValueError) as e:
+                fail(row_number, format_validation_error(e))
+                continue
+            if transaction.account_id not in owned_accounts:
+                fail(row_number, "Account not found")
+                continue
+            batch.append((row_number, transaction))
+            if len(batch) >= TransactionService.IMPORT_BATCH_SIZE:
+                TransactionService._import_batch(db, user_id, batch, result, fail)
+                batch = []
+        if batch:
+            TransactionService._import_batch(db, user_id, batch, result, fail)
+        result.errors.sort(key=lambda item: item.row)
+        return result
+
+    @staticmethod
+    def _import_batch(db: Session, user_id: int, batch, result: ImportResult, fail):
+        # The balance rule is applied row by row in file order against a running balance per
+        # account, as if each row were posted on its own, so only the rows that would overdraw
+        # their account are rejected. Then one balance UPDATE per account (the net change of its
+        # accepted rows), one multi-row INSERT and one rollup upsert per batch.
+        # FOR UPDATE (Postgres) keeps the balances read here from changing before the UPDATEs.
+        account_ids = {transaction.account_id for _, transaction in batch}
+        balances = {account_id: to_cents(balance) for account_id, balance in db.execute(
+            select(DBAccount.id, DBAccount.current_balance)
+            .where(DBAccount.id.in_(account_ids), DBAccount.user_id == user_id, DBAccount.is_active == True)
+            .with_for_update()
+        )}
+
+        accepted = []
+        deltas = {}
+        for row_number, transaction in batch:
+            account_id = transaction.account_id
+            if account_id not in balances:
+                fail(row_number, "Account not found")
+                continue
+            delta = to_cents(TransactionService.balance_delta(transaction.transaction_type, transaction.amount))
+            if delta < 0 and balances[account_id] + delta < 0:
+                fail(row_number, f"Insufficient balance. Available: ${from_cents(balances[account_id]):.2f}, "
+                                 f"Required: ${transaction.amount:.2f}")
+                continue
+            balances[account_id] += delta
+            deltas[account_id] = deltas.get(account_id, 0) + delta
+            accepted.append((row_number, transaction))
+
+        # The conditional UPDATE still guards the balance; it only misses when another writer
+        # changed the account after it was read (possible on SQLite), and then that account's
+        # rows in this batch are rejected
+        rejected = {
+            account_id for account_id, delta in deltas.items()
+            if delta and db.execute(AccountService.balance_update(user_id, account_id, from_cents(delta))).rowcount != 1
+        }
+        if rejected:
+            for row_number, transaction in accepted:
+                if transaction.account_id in rejected:
+                    fail(row_number, "Balance changed during the import; row not applied")
+            accepted = [item for item in accepted if item[1].account_id not in rejected]
+
+        transactions = [transaction for _, transaction in accepted]
+        if transactions:
+            db.execute(insert(DBTransaction), [
+                {**transaction.dict(), "user_id": user_id}
+                for transaction in transactions
+            ])
+            RollupService.record(db, user_id, transactions)
+        db.commit()
+        if transactions:
+            data_versions.bump(user_id)
+        result.imported += len(transactions)
+
+    @staticmethod
+    def balance_delta(transaction_type, amount: float) -> float:
+        # Signed change a transaction makes to its account balance (transfers leave it unchanged)
+        if transaction_type == TransactionType.EXPENSE:
+            return -amount
+        if transaction_type == TransactionType.INCOME:
+            return amount
+        return 0.0
+
+    @staticmethod
+    def recent_transactions_query(user_id: int, limit: int = 50):
+        return select(DBTransaction).options(TransactionService.ACCOUNT_LOADER)\
+            .where(DBTransaction.user_id == user_id)\
+            .order_by(DBTransaction.transaction_date.desc()).limit(limit)
+
     @staticmethod
     def get_user_transactions(db: Session, user_id: int, limit: int = 50):
-        return db.query(DBTransaction).filter(DBTransaction.user_id == user_id)\
-            .order_by(DBTransaction.transaction_date.desc()).limit(limit).all()
+        return db.scalars(TransactionService.recent_transactions_query(user_id, limit)).all()
+
+    @staticmethod
+    def encode_cursor(transaction) -> str:
+        payload = json.dumps({"d": transaction.transaction_date.isoformat(), "i": transaction.id})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return datetime.fromisoformat(payload["d"]), int(payload["i"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    @staticmethod
+    def _filter_page(
+        query,
+        user_id: int,
+        cursor: Optional[str] = None,
+        account_id: Optional[int] = None,
+        category: Optional[str] = None,
+        transaction_type: Optional[TransactionType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ):
+        query = query.filter(DBTransaction.user_id == user_id)
+        if account_id is not None:
+            query = query.filter(DBTransaction.account_id == account_id)
+        if category:
+            query = query.filter(DBTransaction.category == category)
+        if transaction_type:
+            query = query.filter(DBTransaction.transaction_type == transaction_type)
+        if start_date:
+            query = query.filter(DBTransaction.transaction_date >= start_date)
+        if end_date:
+            query = query.filter(DBTransaction.transaction_date <= end_date)
+        if cursor:
+            cursor_date, cursor_id = TransactionService.decode_cursor(cursor)
+            # The redundant <= bound lets the planner seek the index instead of filtering from the top
+            query = query.filter(
+                DBTransaction.transaction_date <= cursor_date,
+                or_(DBTransaction.transaction_date < cursor_date, DBTransaction.id < cursor_id)
+            )
+        return query.order_by(DBTransaction.transaction_date.desc(), DBTransaction.id.desc())
+
+    @staticmethod
+    def _split_page(rows, limit: int):
+        # Pages are fetched with limit + 1 rows; the extra row only signals that another page exists
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, TransactionService.encode_cursor(rows[-1])
+        return rows, None
+
+    @staticmethod
+    def page_query(user_id: int, limit: int = 50, cursor: Optional[str] = None, **filters):
+        query = select(DBTransaction).options(TransactionService.ACCOUNT_LOADER)
+        return TransactionService._filter_page(query, user_id, cursor, **filters).limit(limit + 1)
+
+    @staticmethod
+    def get_transactions_page(db: Session, user_id: int, limit: int = 50, cursor: Optional[str] = None, **filters):
+        # Keyset pagination on (transaction_date, id) descending; returns (transactions, next_cursor)
+        rows = db.scalars(TransactionService.page_query(user_id, limit, cursor, **filters)).all()
+        return TransactionService._split_page(rows, limit)
+
+    # Rows fetched per round trip when streaming exports
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+    @staticmethod
+    def export_query(user_id: int, **filters):
+        query = select(
+            DBTransaction.id,
+            DBTransaction.transaction_date,
+            DBTransaction.transaction_type,
+            DBTransaction.category,
+            DBTransaction.amount,
+            DBTransaction.description,
+            DBTransaction.account_id,
+            DBAccount.account_name
+        ).join(DBAccount, DBAccount.id == DBTransaction.account_id)
+        return TransactionService._filter_page(query, user_id, **filters)
+
+    @staticmethod
+    def export_chunks(user_id: int, chunk_size: Optional[int] = None, **filters):
+        # Yields the user's transactions in lists of chunk_size rows through a server-side cursor
+        # (yield_per), so a multi-year history is never loaded at once. Uses its own (read) session
+        # because the generator outlives the request handler.
+        db = read_session(user_id)
+        try:
+            result = db.execute(
+                TransactionService.export_query(user_id, **filters)
+                .execution_options(yield_per=chunk_size or TransactionService.EXPORT_CHUNK_SIZE)
+            )
+            for partition in result.partitions():
+                yield partition
+        finally:
+            db.close()
+
+    @staticmethod
+    def compact_page_query(user_id: int, limit: int = 50, cursor: Optional[str] = None, **filters):
+        query = select(
+            DBTransaction.id,
+            DBTransaction.account_id,
+            DBTransaction.transaction_type,
+            DBTransaction.category,
+            DBTransaction.amount,
+            DBTransaction.description,
+            DBTransaction.transaction_date,
+            DBTransaction.created_at
+        )
+        return TransactionService._filter_page(query, user_id, cursor, **filters).limit(limit + 1)
+
+    @staticmethod
+    def compact_accounts_query(user_id: int, account_ids):
+        return select(
+            DBAccount.id,
+            DBAccount.platform_id,
+            DBAccount.account_name,
+            DBAccount.account_type,
+            DBAccount.account_number,
+            DBAccount.current_balance,
+            DBAccount.currency,
+            DBAccount.is_active,
+            DBBankingPlatform.name,
+            DBBankingPlatform.platform_type,
+            DBBankingPlatform.logo_url
+        ).join(DBBankingPlatform, DBAccount.platform_id == DBBankingPlatform.id)\
+            .where(and_(DBAccount.id.in_(account_ids), DBAccount.user_id == user_id))
+
+    @staticmethod
+    def build_compact_page(rows, account_rows, next_cursor: Optional[str]):
+        transactions = [
+            {
+                "id": row.id,
+                "account_id": row.account_id,
+                "transaction_type": row.transaction_type,
+                "category": row.category,
+                "amount": row.amount,
+                "description": row.description,
+                "transaction_date": row.transaction_date,
+                "created_at": row.created_at
+            }
+            for row in rows
+        ]
+
+        accounts = {}
+        platforms = {}
+        for row in account_rows:
+            accounts[row.id] = {
+                "id": row.id,
+                "platform_id": row.platform_id,
+                "account_name": row.account_name,
+                "account_type": row.account_type,
+                "account_number": row.account_number,
+                "current_balance": row.current_balance,
+                "currency": row.currency,
+                "is_active": row.is_active
+            }
+            platforms[row.platform_id] = {
+                "id": row.platform_id,
+                "name": row.name,
+                "platform_type": row.platform_type,
+                "logo_url": row.logo_url
+            }
+
+        return {
+            "transactions": transactions,
+            "accounts": accounts,
+            "platforms": platforms,
+            "next_cursor": next_cursor
+        }
+
+    @staticmethod
+    def get_compact_transactions_page(db: Session, user_id: int, limit: int = 50, cursor: Optional[str] = None, **filters):
+        # Same page as get_transactions_page, built from row tuples: transactions reference
+        # their account by id and each distinct account/platform is sent once
+        rows = db.execute(TransactionService.compact_page_query(user_id, limit, cursor, **filters)).all()
+        rows, next_cursor = TransactionService._split_page(rows, limit)
+        account_ids = {row.account_id for row in rows}
+        account_rows = db.execute(TransactionService.compact_accounts_query(user_id, account_ids)).all() if account_ids else []
+        return TransactionService.build_compact_page(rows, account_rows, next_cursor)
 
     @staticmethod
     def get_transactions_by_period(db: Session, user_id: int, start_date: datetime, end_date: datetime):
@@ -146,20 +562,169 @@ class TransactionService:
             )
         ).all()
 
+    @staticmethod
+    def aggregate_by_period(db: Session, user_id: int, start_date: datetime, end_date: datetime):
+        # Sums and counts per (type, category, day) in a single GROUP BY; end_date is exclusive
+        day = func.date(DBTransaction.transaction_date)
+        return db.query(
+            DBTransaction.transaction_type,
+            DBTransaction.category,
+            day.label("day"),
+            func.sum(DBTransaction.amount).label("total"),
+            func.count(DBTransaction.id).label("count")
+        ).filter(
+            and_(
+                DBTransaction.user_id == user_id,
+                DBTransaction.transaction_date >= start_date,
+                DBTransaction.transaction_date < end_date
+            )
+        ).group_by(DBTransaction.transaction_type, DBTransaction.category, day).all()
+
+class RollupService:
+    @staticmethod
+    def record(db: Session, user_id: int, transactions):
+        # Adds the transactions to the monthly rollups inside the caller's DB transaction
+        deltas = {}
+        for t in transactions:
+            transaction_type = getattr(t.transaction_type, "value", t.transaction_type)
+            key = (t.transaction_date.year, t.transaction_date.month, transaction_type, t.category or "")
+            # Summed in integer cents, like the stored totals
+            total, count = deltas.get(key, (0, 0))
+            deltas[key] = (total + to_cents(t.amount), count + 1)
+        if not deltas:
+            return
+
+        stmt = dialect_insert(db, DBMonthlyRollup).values([
+            {
+                "user_id": user_id,
+                "year": year,
+                "month": month,
+                "transaction_type": transaction_type,
+                "category": category,
+                "total_amount": from_cents(total),
+                "transaction_count": count,
+            }
+            for (year, month, transaction_type, category), (total, count) in deltas.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "year", "month", "transaction_type", "category"],
+            set_={
+                "total_amount": DBMonthlyRollup.total_amount + stmt.excluded.total_amount,
+                "transaction_count": DBMonthlyRollup.transaction_count + stmt.excluded.transaction_count,
+            }
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def rebuild(db: Session, user_id: Optional[int] = None):
+        # Recomputes the rollups from transactions, for one user or everyone
+        delete_query = db.query(DBMonthlyRollup)
+        if user_id is not None:
+            delete_query = delete_query.filter(DBMonthlyRollup.user_id == user_id)
+        delete_query.delete(synchronize_session=False)
+
+        year = extract("year", DBTransaction.transaction_date)
+        month = extract("month", DBTransaction.transaction_date)
+        category = func.coalesce(DBTransaction.category, "")
+        source = select(
+            DBTransaction.user_id, year, month, DBTransaction.transaction_type, category,
+            func.sum(DBTransaction.amount), func.count(DBTransaction.id)
+        ).where(
+            DBTransaction.user_id.isnot(None),
+            DBTransaction.transaction_type.isnot(None),
+            DBTransaction.transaction_date.isnot(None)
+        ).group_by(DBTransaction.user_id, year, month, DBTransaction.transaction_type, category)
+        if user_id is not None:
+            source = source.where(DBTransaction.user_id == user_id)
+
+        db.execute(insert(DBMonthlyRollup).from_select(
+            ["user_id", "year", "month", "transaction_type", "category", "total_amount", "transaction_count"],
+            source
+        ))
+        db.commit()
+
+    @staticmethod
+    def month_query(user_id: int, year: int, month: int):
+        return select(
+            DBMonthlyRollup.transaction_type,
+            DBMonthlyRollup.category,
+            DBMonthlyRollup.total_amount.label("total"),
+            DBMonthlyRollup.transaction_count.label("count")
+        ).where(
+            and_(DBMonthlyRollup.user_id == user_id, DBMonthlyRollup.year == year, DBMonthlyRollup.month == month)
+        )
+
+    @staticmethod
+    def get_month(db: Session, user_id: int, year: int, month: int):
+        return db.execute(RollupService.month_query(user_id, year, month)).all()
+
+    @staticmethod
+    def get_monthly_totals(db: Session, user_id: int, start_year: int, start_month: int):
+        # One row per (year, month, type) from the given month onwards
+        return db.query(
+            DBMonthlyRollup.year,
+            DBMonthlyRollup.month,
+            DBMonthlyRollup.transaction_type,
+            func.sum(DBMonthlyRollup.total_amount).label("total"),
+            func.sum(DBMonthlyRollup.transaction_count).label("count")
+        ).filter(
+            DBMonthlyRollup.user_id == user_id,
+            DBMonthlyRollup.year * 12 + DBMonthlyRollup.month >= start_year * 12 + start_month
+        ).group_by(DBMonthlyRollup.year, DBMonthlyRollup.month, DBMonthlyRollup.transaction_type).all()
+
+class BatchService:
+    # Upper bound on operations in one batch request
+    MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "500"))
+
+    @staticmethod
+    def run(db: Session, user_id: int, operations: List[BatchOperation], apply, before_commit=None) -> BatchResult:
+        # Applies each operation in its own savepoint and commits once at the end, so a failed
+        # item is rolled back on its own and reported without affecting the others.
+        # `apply` returns the affected row id or raises HTTPException / ValidationError.
+        if len(operations) > BatchService.MAX_OPERATIONS:
+            raise HTTPException(
+                status_code=400, detail=f"A batch can contain at most {BatchService.MAX_OPERATIONS} operations"
+            )
+        
+        results = []
+        for index, operation in enumerate(operations):
+            try:
+                with db.begin_nested():
+                    item_id = apply(operation)
+                results.append(BatchItemResult(index=index, success=True, id=item_id))
+            except HTTPException as e:
+                results.append(BatchItemResult(index=index, success=False, status_code=e.status_code, error=str(e.detail)))
+            except (ValidationError, TypeError, ValueError) as e:
+                results.append(BatchItemResult(index=index, success=False, status_code=422, error=format_validation_error(e)))
+        
+        if before_commit:
+            before_commit()
+        db.commit()
+        succeeded = sum(1 for result in results if result.success)
+        # Nothing written, nothing to invalidate (and no read-your-writes window to open)
+        if succeeded:
+            data_versions.bump(user_id)
+        return BatchResult(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
 class FinancialGoalService:
     @staticmethod
     def create_goal(db: Session, goal: FinancialGoalCreate, user_id: int):
         db_goal = DBFinancialGoal(**goal.dict(), user_id=user_id)
         db.add(db_goal)
         db.commit()
+        data_versions.bump(user_id)
         db.refresh(db_goal)
         return db_goal
 
     @staticmethod
-    def get_user_goals(db: Session, user_id: int):
-        return db.query(DBFinancialGoal).filter(
+    def user_goals_query(user_id: int):
+        return select(DBFinancialGoal).where(
             and_(DBFinancialGoal.user_id == user_id, DBFinancialGoal.is_active == True)
-        ).all()
+        )
+
+    @staticmethod
+    def get_user_goals(db: Session, user_id: int):
+        return db.scalars(FinancialGoalService.user_goals_query(user_id)).all()
 
     @staticmethod
     def update_goal_progress(db: Session, goal_id: int, current_amount: float, user_id: int):
@@ -169,6 +734,7 @@ class FinancialGoalService:
         if goal:
             goal.current_amount = current_amount
             db.commit()
+            data_versions.bump(user_id)
             db.refresh(goal)
         return goal
 
@@ -181,9 +747,33 @@ class FinancialGoalService:
             for key, value in goal_data.dict().items():
                 setattr(goal, key, value)
             db.commit()
+            data_versions.bump(user_id)
             db.refresh(goal)
         return goal
 
+    @staticmethod
+    def run_batch(db: Session, user_id: int, operations: List[BatchOperation]) -> BatchResult:
+        def apply(operation: BatchOperation):
+            if operation.action == BatchAction.CREATE:
+                goal = DBFinancialGoal(**FinancialGoalCreate(**operation.data).dict(), user_id=user_id)
+                db.add(goal)
+                db.flush()
+                return goal.id
+            
+            goal = db.scalars(select(DBFinancialGoal).where(
+                and_(DBFinancialGoal.id == operation.id, DBFinancialGoal.user_id == user_id)
+            )).first()
+            if not goal:
+                raise HTTPException(status_code=404, detail="Goal not found")
+            if operation.action == BatchAction.UPDATE:
+                for key, value in FinancialGoalUpdate(**operation.data).dict(exclude_unset=True).items():
+                    setattr(goal, key, value)
+            else:
+                goal.is_active = False
+            return goal.id
+
+        return BatchService.run(db, user_id, operations, apply)
+
     @staticmethod
     def delete_goal(db: Session, goal_id: int, user_id: int):
         goal = db.query(DBFinancialGoal).filter(
@@ -192,66 +782,234 @@ class FinancialGoalService:
         if goal:
             goal.is_active = False
             db.commit()
+            data_versions.bump(user_id)
         return {"message": "Goal deleted successfully"}
 
 class FinancialAnalyticsService:
+    METRIC_NAMES = {
+        "monthly_income": "Monthly Income",
+        "monthly_expenses": "Monthly Expenses",
+        "savings_rate": "Savings Rate",
+    }
+
     @staticmethod
-    def calculate_monthly_metrics(db: Session, user_id: int, month: int, year: int):
+    def now() -> datetime:
+        # The clock behind every analytics default ("this month", the last N months), so the
+        # dashboard, health score, trends and categories agree around a month boundary
+        return datetime.now()
+
+    @staticmethod
+    def _month_bounds(month: int, year: int):
         start_date = datetime(year, month, 1)
         if month == 12:
             end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
         else:
             end_date = datetime(year, month + 1, 1) - timedelta(days=1)
+        return start_date, end_date
 
-        transactions = TransactionService.get_transactions_by_period(db, user_id, start_date, end_date)
-        
-        monthly_income = sum(t.amount for t in transactions if t.transaction_type == TransactionType.INCOME)
-        monthly_expenses = sum(t.amount for t in transactions if t.transaction_type == TransactionType.EXPENSE)
-        savings_rate = ((monthly_income - monthly_expenses) / monthly_income * 100) if monthly_income > 0 else 0
+    @staticmethod
+    def calculate_monthly_metrics(db: Session, user_id: int, month: int, year: int, include_daily: bool = False):
+        # Read-only: use materialize_monthly_metrics to persist the results.
+        # Totals come from the monthly rollups; the per-day breakdown needs the raw transactions.
+        start_date, end_date = FinancialAnalyticsService._month_bounds(month, year)
+
+        if include_daily:
+            # The whole last day of the month is included
+            rows = TransactionService.aggregate_by_period(db, user_id, start_date, end_date + timedelta(days=1))
+        else:
+            rows = RollupService.get_month(db, user_id, year, month)
+        return FinancialAnalyticsService.summarize_metrics(rows, include_daily)
 
-        # Save metrics
-        metrics = [
-            DBFinancialMetric(
-                user_id=user_id,
-                metric_name="Monthly Income",
-                metric_value=monthly_income,
-                metric_type="monthly_income",
-                period_start=start_date,
-                period_end=end_date
-            ),
-            DBFinancialMetric(
-                user_id=user_id,
-                metric_name="Monthly Expenses",
-                metric_value=monthly_expenses,
-                metric_type="monthly_expenses",
-                period_start=start_date,
-                period_end=end_date
-            ),
-            DBFinancialMetric(
-                user_id=user_id,
-                metric_name="Savings Rate",
-                metric_value=savings_rate,
-                metric_type="savings_rate",
-                period_start=start_date,
-                period_end=end_date
+    @staticmethod
+    def summarize_metrics(rows, include_daily: bool = False):
+        # Folds (transaction_type, category[, day], total, count) rows into the monthly metrics.
+        # Totals are accumulated in integer cents, so every path that sums them agrees exactly.
+        totals = {TransactionType.INCOME.value: 0, TransactionType.EXPENSE.value: 0}
+        counts = {TransactionType.INCOME.value: 0, TransactionType.EXPENSE.value: 0}
+        categories = {}
+        daily = {}
+        for row in rows:
+            if row.transaction_type not in totals:
+                continue
+            cents = to_cents(row.total)
+            totals[row.transaction_type] += cents
+            counts[row.transaction_type] += row.count
+
+            category = categories.setdefault(
+                (row.transaction_type, row.category),
+                {"transaction_type": row.transaction_type, "category": row.category, "total": 0, "count": 0}
             )
-        ]
+            category["total"] += cents
+            category["count"] += row.count
 
-        for metric in metrics:
-            db.add(metric)
-        db.commit()
+            if include_daily:
+                day = daily.setdefault(str(row.day), {"date": str(row.day), "income": 0, "expenses": 0, "count": 0})
+                day["income" if row.transaction_type == TransactionType.INCOME else "expenses"] += cents
+                day["count"] += row.count
 
-        return {
+        for category in categories.values():
+            category["total"] = from_cents(category["total"])
+        for day in daily.values():
+            day["income"], day["expenses"] = from_cents(day["income"]), from_cents(day["expenses"])
+        monthly_income = from_cents(totals[TransactionType.INCOME.value])
+        monthly_expenses = from_cents(totals[TransactionType.EXPENSE.value])
+        savings_rate = ((monthly_income - monthly_expenses) / monthly_income * 100) if monthly_income > 0 else 0
+
+        metrics = {
             "monthly_income": monthly_income,
             "monthly_expenses": monthly_expenses,
-            "savings_rate": savings_rate
+            "savings_rate": savings_rate,
+            "income_count": counts[TransactionType.INCOME.value],
+            "expense_count": counts[TransactionType.EXPENSE.value],
+            "categories": sorted(categories.values(), key=lambda c: c["total"], reverse=True)
         }
+        if include_daily:
+            metrics["daily"] = [daily[key] for key in sorted(daily)]
+        return metrics
+
+    @staticmethod
+    def get_monthly_history(db: Session, user_id: int, months: int = 12):
+        # Income/expense series for the last `months` months, read from the rollups
+        today = FinancialAnalyticsService.now()
+        month_index = today.year * 12 + today.month - 1 - (months - 1)
+        start_year, start_month = divmod(month_index, 12)
+        start_month += 1
+
+        series = {}
+        for offset in range(months):
+            year, month = divmod(month_index + offset, 12)
+            series[(year, month + 1)] = {"year": year, "month": month + 1, "income": 0, "expenses": 0, "count": 0}
+
+        for row in RollupService.get_monthly_totals(db, user_id, start_year, start_month):
+            entry = series.get((row.year, row.month))
+            if entry is None:
+                continue
+            # In integer cents until all rows are added
+            if row.transaction_type == TransactionType.INCOME:
+                entry["income"] += to_cents(row.total)
+            elif row.transaction_type == TransactionType.EXPENSE:
+                entry["expenses"] += to_cents(row.total)
+            entry["count"] += row.count
+
+        for entry in series.values():
+            entry["net"] = from_cents(entry["income"] - entry["expenses"])
+            entry["income"], entry["expenses"] = from_cents(entry["income"]), from_cents(entry["expenses"])
+            entry["savings_rate"] = (entry["net"] / entry["income"] * 100) if entry["income"] > 0 else 0
+        return list(series.values())
+
+    @staticmethod
+    def materialize_monthly_metrics(db: Session, user_id: int, month: int, year: int):
+        # Idempotent: upserts one row per (user, metric_type, period)
+        start_date, end_date = FinancialAnalyticsService._month_bounds(month, year)
+        values = FinancialAnalyticsService.calculate_monthly_metrics(db, user_id, month, year)
+        calculation_date = datetime.utcnow()
+
+        stmt = dialect_insert(db, DBFinancialMetric).values([
+            {
+                "user_id": user_id,
+                "metric_name": metric_name,
+                "metric_value": values[metric_type],
+                "metric_type": metric_type,
+                "calculation_date": calculation_date,
+                "period_start": start_date,
+                "period_end": end_date,
+            }
+            for metric_type, metric_name in FinancialAnalyticsService.METRIC_NAMES.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "metric_type", "period_start"],
+            set_={
+                "metric_name": stmt.excluded.metric_name,
+                "metric_value": stmt.excluded.metric_value,
+                "calculation_date": stmt.excluded.calculation_date,
+                "period_end": stmt.excluded.period_end,
+            }
+        )
+        db.execute(stmt)
+        db.commit()
+
+        return db.query(DBFinancialMetric).filter(
+            and_(DBFinancialMetric.user_id == user_id, DBFinancialMetric.period_start == start_date)
+        ).order_by(DBFinancialMetric.id).all()
 
     @staticmethod
     def get_financial_overview(db: Session, user_id: int) -> FinancialOverview:
-        # Get all accounts grouped by platform
         accounts = AccountService.get_user_accounts(db, user_id)
-        total_balance = sum(account.current_balance for account in accounts)
+
+        # Get current month metrics
+        current_date = FinancialAnalyticsService.now()
+        current_metrics = FinancialAnalyticsService.calculate_monthly_metrics(
+            db, user_id, current_date.month, current_date.year
+        )
+
+        # Get recent transactions
+        recent_transactions = TransactionService.get_user_transactions(db, user_id, 10)
+
+        # Get active goals
+        active_goals = FinancialGoalService.get_user_goals(db, user_id)
+
+        return FinancialAnalyticsService.build_overview(accounts, current_metrics, recent_transactions, active_goals)
+
+    # Serialized overviews keyed by ETag, i.e. by (data version, month): writes bump the version,
+    # so entries are never invalidated explicitly. The version is shared by all workers (database
+    # or Redis), so a write on any worker retires every worker's entry; the entries themselves
+    # are per process unless CACHE_BACKEND=redis.
+    overview_cache = shared_cache(
+        "overview",
+        maxsize=int(os.getenv("OVERVIEW_CACHE_SIZE", "1024")),
+        ttl=float(os.getenv("OVERVIEW_CACHE_TTL_SECONDS", "300"))
+    )
+
+    @staticmethod
+    def overview_etag(user_id: int) -> str:
+        return user_etag("overview", user_id, f"{FinancialAnalyticsService.now():%Y%m}")
+
+    @staticmethod
+    def get_cached_overview(user_id: int, etag: str) -> Optional[bytes]:
+        return FinancialAnalyticsService.overview_cache.get(f"{user_id}:{etag}")
+
+    @staticmethod
+    def store_overview(user_id: int, etag: str, overview: FinancialOverview) -> bytes:
+        body = overview.model_dump_json().encode()
+        FinancialAnalyticsService.overview_cache.set(f"{user_id}:{etag}", body)
+        return body
+
+    @staticmethod
+    def get_overview_json(db: Session, user_id: int, etag: str) -> bytes:
+        body = FinancialAnalyticsService.get_cached_overview(user_id, etag)
+        if body is None:
+            overview = FinancialAnalyticsService.get_financial_overview(db, user_id)
+            body = FinancialAnalyticsService.store_overview(user_id, etag, overview)
+        return body
+
+    @staticmethod
+    def get_financial_snapshot(db: Session, user_id: int) -> FinancialSnapshot:
+        # Headline figures only (no recent transactions or per-account detail), for the health
+        # score and the AI assistant; FinancialHealthService caches it per user
+        current_date = FinancialAnalyticsService.now()
+        balances = db.execute(AccountService.balance_summary_query(user_id)).one()
+        current_metrics = FinancialAnalyticsService.calculate_monthly_metrics(
+            db, user_id, current_date.month, current_date.year
+        )
+        active_goals = FinancialGoalService.get_user_goals(db, user_id)
+        return FinancialAnalyticsService.build_snapshot(balances, current_metrics, active_goals)
+
+    @staticmethod
+    def build_snapshot(balances, current_metrics, active_goals) -> FinancialSnapshot:
+        return FinancialSnapshot(
+            total_balance=balances.total_balance,
+            monthly_income=current_metrics["monthly_income"],
+            monthly_expenses=current_metrics["monthly_expenses"],
+            savings_rate=current_metrics["savings_rate"],
+            account_count=balances.account_count,
+            platform_count=balances.platform_count,
+            account_type_count=balances.account_type_count,
+            active_goals=active_goals
+        )
+
+    @staticmethod
+    def build_overview(accounts, current_metrics, recent_transactions, active_goals) -> FinancialOverview:
+        total_balance = from_cents(sum(to_cents(account.current_balance) for account in accounts))
 
         # Group accounts by platform
         platform_summaries = {}
@@ -265,21 +1023,11 @@ class FinancialAnalyticsService:
                     "account_count": 0,
                     "accounts": []
                 }
-            platform_summaries[platform_name]["total_balance"] += account.current_balance
+            platform_summaries[platform_name]["total_balance"] += to_cents(account.current_balance)
             platform_summaries[platform_name]["account_count"] += 1
             platform_summaries[platform_name]["accounts"].append(account)
-
-        # Get current month metrics
-        current_date = datetime.now()
-        current_metrics = FinancialAnalyticsService.calculate_monthly_metrics(
-            db, user_id, current_date.month, current_date.year
-        )
-
-        # Get recent transactions
-        recent_transactions = TransactionService.get_user_transactions(db, user_id, 10)
-
-        # Get active goals
-        active_goals = FinancialGoalService.get_user_goals(db, user_id)
+        for summary in platform_summaries.values():
+            summary["total_balance"] = from_cents(summary["total_balance"])
 
         return FinancialOverview(
             total_balance=total_balance,
@@ -291,127 +1039,291 @@ class FinancialAnalyticsService:
             active_goals=active_goals
         )
 
-class AIAssistantService:
+class FinancialHealthService:
+    # Snapshots and scores by (user_id, data version, year, month): any committed write bumps the
+    # user's version, so entries never need explicit invalidation. The TTL bounds staleness from
+    # writes made outside the services (e.g. scripts) and memory held for idle users.
+    cache = TTLCache(
+        maxsize=int(os.getenv("HEALTH_CACHE_SIZE", "1024")),
+        ttl=float(os.getenv("HEALTH_CACHE_TTL_SECONDS", "300"))
+    )
+
     @staticmethod
-    async def get_financial_advice(db: Session, user_id: int, query: str) -> AIResponse:
-        import os
-        from openai import OpenAI
-        
-        # Get user's financial overview for context
-        overview = FinancialAnalyticsService.get_financial_overview(db, user_id)
-        
-        # Generate recommendations based on the financial data
+    def score(snapshot: FinancialSnapshot) -> FinancialHealth:
+        income, expenses = snapshot.monthly_income, snapshot.monthly_expenses
+        net_income = income - expenses
+        expense_ratio = expenses / income * 100 if income > 0 else None
+        goal_progress = (
+            sum(goal.current_amount / goal.target_amount if goal.target_amount > 0 else 0 for goal in snapshot.active_goals)
+            / len(snapshot.active_goals) * 100
+        ) if snapshot.active_goals else 0.0
+
+        savings_rate = snapshot.savings_rate
+        components = {
+            # Savings rate (0-30 points)
+            "savings_rate": 30 if savings_rate >= 20 else 20 if savings_rate >= 10 else 10 if savings_rate >= 5 else 0,
+            # Income vs expenses (0-20 points)
+            "cash_flow": 20 if net_income > 0 else 10 if net_income >= -100 else 0,
+            # Account diversity (0-20 points)
+            "diversification": min(snapshot.account_type_count * 5, 20),
+            # Goal progress (0-10 points)
+            "goal_progress": min(goal_progress / 10, 10),
+        }
+        score = round(min(max(50 + sum(components.values()), 0), 100))
+
         recommendations = []
-        if overview.savings_rate < 20:
-            recommendations.append("Consider increasing your savings rate to at least 20%")
-        if overview.monthly_expenses > overview.monthly_income * 0.8:
+        if savings_rate < 20:
+            recommendations.append("Increase your savings rate to at least 20%")
+        if expenses > income * 0.8:
             recommendations.append("Review your expenses to identify areas for cost reduction")
-        if len(overview.active_goals) == 0:
+        if not snapshot.active_goals:
             recommendations.append("Set specific financial goals to stay motivated")
-        if len(overview.account_summaries) < 2:
-            recommendations.append("Consider diversifying across multiple account types")
-        
-        # Prepare financial context for the AI
+        if snapshot.account_type_count < 3:
+            recommendations.append("Diversify your accounts across different types")
+
+        if score >= 80:
+            rating = "Excellent financial health!"
+        elif score >= 60:
+            rating = "Good financial health"
+        elif score >= 40:
+            rating = "Fair financial health"
+        else:
+            rating = "Needs improvement"
+
+        return FinancialHealth(
+            score=score,
+            rating=rating,
+            savings_rate=savings_rate,
+            expense_ratio=expense_ratio,
+            goal_progress=goal_progress,
+            account_type_count=snapshot.account_type_count,
+            components=components,
+            recommendations=recommendations[:3]
+        )
+
+    @staticmethod
+    def cache_key(user_id: int):
+        # Taken before loading, so a write during the load leaves the entry under the old version
+        current_date = FinancialAnalyticsService.now()
+        return (user_id, data_versions.get(user_id), current_date.year, current_date.month)
+
+    @staticmethod
+    def store(key, snapshot: FinancialSnapshot):
+        entry = (snapshot, FinancialHealthService.score(snapshot))
+        FinancialHealthService.cache.set(key, entry)
+        return entry
+
+    @staticmethod
+    def get_entry(db: Session, user_id: int):
+        key = FinancialHealthService.cache_key(user_id)
+        entry = FinancialHealthService.cache.get(key)
+        if entry is None:
+            entry = FinancialHealthService.store(key, FinancialAnalyticsService.get_financial_snapshot(db, user_id))
+        return entry
+
+    @staticmethod
+    def get_snapshot(db: Session, user_id: int) -> FinancialSnapshot:
+        return FinancialHealthService.get_entry(db, user_id)[0]
+
+    @staticmethod
+    def get_health(db: Session, user_id: int) -> FinancialHealth:
+        return FinancialHealthService.get_entry(db, user_id)[1]
+
+# Keep proxies from buffering or caching the advice event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+class AIAssistantService:
+    SYSTEM_PROMPT = "You are an expert financial advisor AI assistant. Provide helpful, practical, and personalized financial advice based on the user's financial data. Be concise (2-3 paragraphs), encouraging, and actionable. Use emojis sparingly for emphasis."
+
+    # Provider answers keyed by provider, financial context and normalized query
+    advice_cache = TTLCache(maxsize=AI_CACHE_SIZE, ttl=AI_CACHE_TTL_SECONDS)
+
+    @staticmethod
+    async def get_financial_advice(db: Session, user_id: int, query: str) -> AIResponse:
+        # Get user's financial snapshot for context; the sync session's queries run off the event loop
+        snapshot = await run_in_threadpool(FinancialHealthService.get_snapshot, db, user_id)
+        return await AIAssistantService.advise(snapshot, query)
+
+    @staticmethod
+    async def get_advice_stream(db: Session, user_id: int, query: str):
+        # The snapshot is loaded up front so the stream itself never touches the session
+        snapshot = await run_in_threadpool(FinancialHealthService.get_snapshot, db, user_id)
+        return AIAssistantService.stream_advice(snapshot, query)
+
+    @staticmethod
+    def build_recommendations(snapshot: FinancialSnapshot) -> List[str]:
+        return FinancialHealthService.score(snapshot).recommendations
+
+    @staticmethod
+    def build_financial_context(snapshot: FinancialSnapshot) -> str:
         financial_context = f"""
 User's Financial Overview:
-- Total Balance: ${overview.total_balance:,.2f}
-- Monthly Income: ${overview.monthly_income:,.2f}
-- Monthly Expenses: ${overview.monthly_expenses:,.2f}
-- Savings Rate: {overview.savings_rate:.1f}%
-- Active Financial Goals: {len(overview.active_goals)}
-- Number of Accounts: {len(overview.account_summaries)} across different platforms
+- Total Balance: ${snapshot.total_balance:,.2f}
+- Monthly Income: ${snapshot.monthly_income:,.2f}
+- Monthly Expenses: ${snapshot.monthly_expenses:,.2f}
+- Savings Rate: {snapshot.savings_rate:.1f}%
+- Active Financial Goals: {len(snapshot.active_goals)}
+- Number of Accounts: {snapshot.platform_count} across different platforms
 """
         
-        if len(overview.active_goals) > 0:
+        if len(snapshot.active_goals) > 0:
             financial_context += "\nActive Goals:\n"
-            for goal in overview.active_goals[:3]:  # Show top 3 goals
+            for goal in snapshot.active_goals[:3]:  # Show top 3 goals
                 progress = (goal.current_amount / goal.target_amount * 100) if goal.target_amount > 0 else 0
                 financial_context += f"- {goal.goal_name}: ${goal.current_amount:,.2f} / ${goal.target_amount:,.2f} ({progress:.1f}% complete)\n"
+        return financial_context
+
+    @staticmethod
+    def build_user_prompt(financial_context: str, query: str) -> str:
+        return f"{financial_context}\n\nUser Question: {query}\n\nPlease provide specific advice based on my financial situation."
+
+    @staticmethod
+    def advice_cache_key(provider_name: str, financial_context: str, query: str) -> str:
+        normalized_query = " ".join(query.lower().split())
+        return hashlib.sha256(f"{provider_name}\n{financial_context}\n{normalized_query}".encode()).hexdigest()
+
+    @staticmethod
+    async def advise(snapshot: FinancialSnapshot, query: str) -> AIResponse:
+        recommendations = AIAssistantService.build_recommendations(snapshot)[:3]
+        provider = get_provider()
         
-        # Check if OpenAI API key is configured
-        api_key = os.getenv('OPENAI_API_KEY')
-        
-        if api_key and api_key != 'your-openai-api-key-here':
-            # Use OpenAI API
+        if provider is not None:
+            financial_context = AIAssistantService.build_financial_context(snapshot)
+            cache_key = AIAssistantService.advice_cache_key(provider.name, financial_context, query)
+            # Only the provider's text is cached; the recommendations always come from this snapshot
+            cached = AIAssistantService.advice_cache.get(cache_key)
+            if cached is not None:
+                return AIResponse(response=cached, recommendations=recommendations, confidence=provider.confidence)
+            
             try:
-                client = OpenAI(api_key=api_key)
-                
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are an expert financial advisor AI assistant. Provide helpful, practical, and personalized financial advice based on the user's financial data. Be concise (2-3 paragraphs), encouraging, and actionable. Use emojis sparingly for emphasis."
-                        },
-                        {
-                            "role": "user",
-                            "content": f"{financial_context}\n\nUser Question: {query}\n\nPlease provide specific advice based on my financial situation."
-                        }
-                    ],
-                    max_tokens=400,
-                    temperature=0.7
+                ai_response = await asyncio.wait_for(
+                    provider.complete(
+                        AIAssistantService.SYSTEM_PROMPT,
+                        AIAssistantService.build_user_prompt(financial_context, query)
+                    ),
+                    timeout=AI_TIMEOUT_SECONDS
                 )
-                
-                ai_response = response.choices[0].message.content
-                
+                AIAssistantService.advice_cache.set(cache_key, ai_response)
                 return AIResponse(
                     response=ai_response,
-                    recommendations=recommendations[:3],
-                    confidence=0.95
+                    recommendations=recommendations,
+                    confidence=provider.confidence
                 )
-                
             except Exception as e:
-                print(f"OpenAI API Error: {e}")
-                # Fallback to rule-based system
+                # Timeouts and provider errors fall back to the rule-based engine (not cached)
+                print(f"AI provider error ({provider.name}): {e!r}")
         
-        # Fallback: Rule-based responses (when no API key or API fails)
+        return AIResponse(
+            response=AIAssistantService.rule_based_response(snapshot, query),
+            recommendations=recommendations,
+            confidence=0.85
+        )
+
+    @staticmethod
+    def format_event(event: str, data: dict) -> str:
+        # One Server-Sent Events message
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    @staticmethod
+    async def stream_advice(snapshot: FinancialSnapshot, query: str):
+        # Yields SSE messages: a "token" event per chunk of text, then a "done" event with the
+        # recommendations and confidence. Chunks are sent as soon as the provider produces them.
+        recommendations = AIAssistantService.build_recommendations(snapshot)[:3]
+        provider = get_provider()
+        
+        if provider is not None:
+            financial_context = AIAssistantService.build_financial_context(snapshot)
+            cache_key = AIAssistantService.advice_cache_key(provider.name, financial_context, query)
+            cached = AIAssistantService.advice_cache.get(cache_key)
+            if cached is not None:
+                for chunk in split_chunks(cached):
+                    yield AIAssistantService.format_event("token", {"text": chunk})
+                yield AIAssistantService.format_event("done", {
+                    "recommendations": recommendations, "confidence": provider.confidence
+                })
+                return
+            
+            chunks = []
+            stream = provider.stream(
+                AIAssistantService.SYSTEM_PROMPT,
+                AIAssistantService.build_user_prompt(financial_context, query)
+            )
+            try:
+                while True:
+                    # The timeout bounds the wait for each chunk, including the first one
+                    chunk = await asyncio.wait_for(stream.__anext__(), timeout=AI_TIMEOUT_SECONDS)
+                    chunks.append(chunk)
+                    yield AIAssistantService.format_event("token", {"text": chunk})
+            except StopAsyncIteration:
+                AIAssistantService.advice_cache.set(cache_key, "".join(chunks))
+                yield AIAssistantService.format_event("done", {
+                    "recommendations": recommendations, "confidence": provider.confidence
+                })
+                return
+            except Exception as e:
+                print(f"AI provider error ({provider.name}): {e!r}")
+            finally:
+                await stream.aclose()
+            
+            if chunks:
+                # The answer was cut off part-way; finish with what was sent rather than restart it
+                yield AIAssistantService.format_event("done", {
+                    "recommendations": recommendations, "confidence": provider.confidence
+                })
+                return
+        
+        for chunk in split_chunks(AIAssistantService.rule_based_response(snapshot, query)):
+            yield AIAssistantService.format_event("token", {"text": chunk})
+        yield AIAssistantService.format_event("done", {"recommendations": recommendations, "confidence": 0.85})
+
+    @staticmethod
+    def rule_based_response(snapshot: FinancialSnapshot, query: str) -> str:
         query_lower = query.lower()
         
         if 'sav' in query_lower or 'save' in query_lower:
-            response = f"Based on your current financial situation, you have a savings rate of {overview.savings_rate:.1f}%. Your monthly income is ${overview.monthly_income:,.2f} and expenses are ${overview.monthly_expenses:,.2f}. "
-            if overview.savings_rate < 10:
+            response = f"Based on your current financial situation, you have a savings rate of {snapshot.savings_rate:.1f}%. Your monthly income is ${snapshot.monthly_income:,.2f} and expenses are ${snapshot.monthly_expenses:,.2f}. "
+            if snapshot.savings_rate < 10:
                 response += "I recommend focusing on reducing expenses and increasing your savings rate to at least 10-20%. Start by tracking all expenses and identifying areas where you can cut back."
-            elif overview.savings_rate < 20:
+            elif snapshot.savings_rate < 20:
                 response += "You're making progress! Try to increase your savings rate to 20% for a healthier financial cushion. Consider automating your savings."
             else:
                 response += "Excellent savings rate! Consider investing some of your savings for long-term growth."
                 
         elif 'budget' in query_lower or 'expense' in query_lower or 'spend' in query_lower:
-            response = f"Your current monthly expenses are ${overview.monthly_expenses:,.2f}, which is {(overview.monthly_expenses/overview.monthly_income*100):.1f}% of your income. "
-            if overview.monthly_expenses > overview.monthly_income:
+            if snapshot.monthly_income > 0:
+                response = f"Your current monthly expenses are ${snapshot.monthly_expenses:,.2f}, which is {(snapshot.monthly_expenses/snapshot.monthly_income*100):.1f}% of your income. "
+            else:
+                response = f"Your current monthly expenses are ${snapshot.monthly_expenses:,.2f} and no income has been recorded this month. "
+            if snapshot.monthly_expenses > snapshot.monthly_income:
                 response += "⚠️ Your expenses exceed your income. This is unsustainable. Review all expenses immediately and cut non-essential spending."
-            elif overview.monthly_expenses > overview.monthly_income * 0.8:
+            elif snapshot.monthly_expenses > snapshot.monthly_income * 0.8:
                 response += "You're spending a high percentage of your income. Try the 50/30/20 rule: 50% needs, 30% wants, 20% savings."
             else:
                 response += "Your expense ratio looks healthy. Keep tracking your spending and look for optimization opportunities."
                 
         elif 'goal' in query_lower:
-            response = f"You currently have {len(overview.active_goals)} active financial goals. "
-            if len(overview.active_goals) == 0:
+            response = f"You currently have {len(snapshot.active_goals)} active financial goals. "
+            if len(snapshot.active_goals) == 0:
                 response += "Setting specific goals is crucial for financial success. Consider creating goals for: emergency fund (3-6 months expenses), retirement savings, major purchases, or debt reduction."
             else:
                 response += "Great job setting goals! Review them regularly and adjust contributions as your income grows. Breaking large goals into smaller milestones helps maintain motivation."
                 
         elif 'invest' in query_lower:
-            if overview.savings_rate < 10:
+            if snapshot.savings_rate < 10:
                 response = "Before investing, focus on building an emergency fund covering 3-6 months of expenses. Once that's established, consider low-cost index funds for long-term growth."
             else:
-                response = f"With a {overview.savings_rate:.1f}% savings rate, you may be ready to invest. Consider: 1) Max out retirement accounts (401k/IRA), 2) Low-cost index funds, 3) Diversify across stocks and bonds based on your risk tolerance."
+                response = f"With a {snapshot.savings_rate:.1f}% savings rate, you may be ready to invest. Consider: 1) Max out retirement accounts (401k/IRA), 2) Low-cost index funds, 3) Diversify across stocks and bonds based on your risk tolerance."
                 
         elif 'debt' in query_lower:
             response = "Debt management strategies: 1) Pay high-interest debt first (credit cards), 2) Consider debt avalanche or snowball method, 3) Avoid new debt while paying existing, 4) Look into debt consolidation if you have multiple loans."
             
         else:
-            response = f"Here's an overview of your finances: Total Balance: ${overview.total_balance:,.2f}, Monthly Income: ${overview.monthly_income:,.2f}, Expenses: ${overview.monthly_expenses:,.2f}, Savings Rate: {overview.savings_rate:.1f}%. "
-            if overview.savings_rate >= 20 and overview.monthly_expenses < overview.monthly_income:
+            response = f"Here's an overview of your finances: Total Balance: ${snapshot.total_balance:,.2f}, Monthly Income: ${snapshot.monthly_income:,.2f}, Expenses: ${snapshot.monthly_expenses:,.2f}, Savings Rate: {snapshot.savings_rate:.1f}%. "
+            if snapshot.savings_rate >= 20 and snapshot.monthly_expenses < snapshot.monthly_income:
                 response += "Your finances look healthy! Focus on maintaining good habits and consider increasing investments for long-term growth."
-            elif overview.savings_rate >= 10:
+            elif snapshot.savings_rate >= 10:
                 response += "You're on the right track. Work on increasing your savings rate and setting specific financial goals."
             else:
                 response += "There's room for improvement. Focus on reducing expenses, increasing income if possible, and building better savings habits."
         
-        return AIResponse(
-            response=response,
-            recommendations=recommendations[:3],
-            confidence=0.85
-        )
+        return response
@@ -4,8 +4,34 @@ import axios from 'axios'
 
 export const useAIStore = defineStore('ai', () => {
   const isLoading = ref(false)
+  // True until the streamed answer has finished, after the "thinking" indicator is gone
+  const isStreaming = ref(false)
   const chatHistory = ref([])
 
+  // Reads a Server-Sent Events response body and calls onEvent(event, data) for each message
+  const readEventStream = async (body, onEvent) => {
+    const reader = body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+      let boundary
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, boundary)
+        buffer = buffer.slice(boundary + 2)
+        let event = 'message'
+        let data = ''
+        for (const line of block.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7)
+          else if (line.startsWith('data: ')) data += line.slice(6)
+        }
+        if (data) onEvent(event, JSON.parse(data))
+      }
+    }
+  }
+
   const getFinancialAdvice = async (query) => {
     // Add user message immediately
     chatHistory.value.push({
@@ -15,20 +41,52 @@ export const useAIStore = defineStore('ai', () => {
     })
     
     isLoading.value = true
+    isStreaming.value = true
+    let aiMessage = null
     try {
-      const response = await axios.post('/api/ai/advice', { query })
-      const aiResponse = response.data
+      // fetch rather than axios so the answer can be rendered while it is still being generated
+      const response = await fetch('/api/ai/advice/stream', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          Authorization: axios.defaults.headers.common['Authorization']
+        },
+        body: JSON.stringify({ query })
+      })
+      if (!response.ok) {
+        const detail = await response.json().catch(() => ({}))
+        throw { response: { data: detail } }
+      }
       
-      // Add AI response to chat history
-      chatHistory.value.push({
-        type: 'ai',
-        message: aiResponse.response,
-        recommendations: aiResponse.recommendations,
-        confidence: aiResponse.confidence,
-        timestamp: new Date()
+      // Add the AI message on the first token and grow it as the rest arrives
+      await readEventStream(response.body, (event, data) => {
+        if (event === 'token') {
+          if (!aiMessage) {
+            chatHistory.value.push({
+              type: 'ai',
+              message: '',
+              recommendations: [],
+              confidence: null,
+              timestamp: new Date()
+            })
+            aiMessage = chatHistory.value[chatHistory.value.length - 1]
+            isLoading.value = false
+          }
+          aiMessage.message += data.text
+        } else if (event === 'done' && aiMessage) {
+          aiMessage.recommendations = data.recommendations
+          aiMessage.confidence = data.confidence
+        }
       })
       
-      return { success: true, data: aiResponse }
+      return {
+        success: true,
+        data: aiMessage && {
+          response: aiMessage.message,
+          recommendations: aiMessage.recommendations,
+          confidence: aiMessage.confidence
+        }
+      }
     } catch (error) {
       console.error('AI advice error:', error)
       // Add error message to chat
@@ -44,6 +102,7 @@ export const useAIStore = defineStore('ai', () => {
       }
     } finally {
       isLoading.value = false
+      isStreaming.value = false
     }
   }
 
@@ -53,6 +112,7 @@ export const useAIStore = defineStore('ai', () => {
 
   return {
     isLoading,
+    isStreaming,
     chatHistory,
     getFinancialAdvice,
     clearChatHistory
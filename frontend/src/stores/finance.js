@@ -8,7 +8,13 @@ export const useFinanceStore = defineStore('finance', () => {
   const goals = ref([])
   const platforms = ref([])
   const overview = ref(null)
+  // Health score and recommendations from /api/analytics/health
+  const health = ref(null)
   const isLoading = ref(false)
+  const transactionFilters = ref({})
+  const nextTransactionsCursor = ref(null)
+
+  const hasMoreTransactions = computed(() => !!nextTransactionsCursor.value)
 
   const totalBalance = computed(() => {
     return accounts.value.reduce((sum, account) => sum + account.current_balance, 0)
@@ -107,15 +113,35 @@ export const useFinanceStore = defineStore('finance', () => {
   }
 
   // Transaction operations
-  const fetchTransactions = async (limit = 50) => {
+  // Filters: account_id, category, transaction_type, start_date, end_date
+  const fetchTransactions = async (limit = 50, filters = {}) => {
     try {
-      const response = await axios.get(`/api/transactions?limit=${limit}`)
+      const params = { limit }
+      Object.entries(filters).forEach(([key, value]) => {
+        if (value !== '' && value !== null && value !== undefined) params[key] = value
+      })
+      const response = await axios.get('/api/transactions', { params })
       transactions.value = response.data
+      transactionFilters.value = params
+      nextTransactionsCursor.value = response.headers['x-next-cursor'] || null
     } catch (error) {
       console.error('Error fetching transactions:', error)
     }
   }
 
+  // Loads the next page with the same filters, using the cursor from the previous response
+  const fetchMoreTransactions = async () => {
+    if (!nextTransactionsCursor.value) return
+    try {
+      const params = { ...transactionFilters.value, cursor: nextTransactionsCursor.value }
+      const response = await axios.get('/api/transactions', { params })
+      transactions.value.push(...response.data)
+      nextTransactionsCursor.value = response.headers['x-next-cursor'] || null
+    } catch (error) {
+      console.error('Error fetching more transactions:', error)
+    }
+  }
+
   const createTransaction = async (transactionData) => {
     try {
       const response = await axios.post('/api/transactions', transactionData)
@@ -219,6 +245,35 @@ export const useFinanceStore = defineStore('finance', () => {
     }
   }
 
+  // Batch operations: many changes in one request and one DB transaction.
+  // operations: [{ action: 'create' | 'update' | 'delete', id, data }] for goals and accounts;
+  // transactions only take 'create' (other actions fail per item with status_code 400)
+  // Resolves to { success, data: { succeeded, failed, results: [{ index, success, id, error }] } }
+  const runBatch = async (url, operations, refresh) => {
+    try {
+      const response = await axios.post(url, { operations })
+      if (response.data.succeeded > 0) {
+        await Promise.all(refresh.map(fetch => fetch()))
+      }
+      return { success: response.data.failed === 0, data: response.data }
+    } catch (error) {
+      return { 
+        success: false, 
+        error: error.response?.data?.detail || 'Failed to apply batch' 
+      }
+    }
+  }
+
+  const createTransactionsBatch = (transactionsData) => runBatch(
+    '/api/transactions/batch',
+    transactionsData.map(data => ({ action: 'create', data })),
+    [() => fetchTransactions(transactionFilters.value.limit || 50, transactionFilters.value), fetchAccounts]
+  )
+
+  const applyGoalsBatch = (operations) => runBatch('/api/goals/batch', operations, [fetchGoals])
+
+  const applyAccountsBatch = (operations) => runBatch('/api/accounts/batch', operations, [fetchAccounts])
+
   // Platform operations
   const fetchPlatforms = async () => {
     try {
@@ -242,6 +297,15 @@ export const useFinanceStore = defineStore('finance', () => {
     }
   }
 
+  const fetchHealth = async () => {
+    try {
+      const response = await axios.get('/api/analytics/health')
+      health.value = response.data
+    } catch (error) {
+      console.error('Error fetching health score:', error)
+    }
+  }
+
   const fetchMonthlyMetrics = async (year, month) => {
     try {
       const response = await axios.get(`/api/analytics/monthly/${year}/${month}`)
@@ -252,6 +316,28 @@ export const useFinanceStore = defineStore('finance', () => {
     }
   }
 
+  // Server-side analytics over the full history (params: months, year, month, window)
+  const fetchTrends = async (params = {}) => {
+    try {
+      const response = await axios.get('/api/analytics/trends', { params })
+      return response.data
+    } catch (error) {
+      console.error('Error fetching trends:', error)
+      return null
+    }
+  }
+
+  // params: year, month (or start_date, end_date), transaction_type
+  const fetchCategoryBreakdown = async (params = {}) => {
+    try {
+      const response = await axios.get('/api/analytics/categories', { params })
+      return response.data
+    } catch (error) {
+      console.error('Error fetching category breakdown:', error)
+      return null
+    }
+  }
+
   // Initialize data
   const initializeData = async () => {
     await Promise.all([
@@ -259,7 +345,8 @@ export const useFinanceStore = defineStore('finance', () => {
       fetchAccounts(),
       fetchTransactions(),
       fetchGoals(),
-      fetchOverview()
+      fetchOverview(),
+      fetchHealth()
     ])
   }
 
@@ -269,7 +356,9 @@ export const useFinanceStore = defineStore('finance', () => {
     goals,
     platforms,
     overview,
+    health,
     isLoading,
+    hasMoreTransactions,
     totalBalance,
     accountsByPlatform,
     fetchAccounts,
@@ -278,15 +367,22 @@ export const useFinanceStore = defineStore('finance', () => {
     updateAccountBalance,
     deleteAccount,
     fetchTransactions,
+    fetchMoreTransactions,
     createTransaction,
     fetchGoals,
     createGoal,
     updateGoal,
     updateGoalProgress,
     deleteGoal,
+    createTransactionsBatch,
+    applyGoalsBatch,
+    applyAccountsBatch,
     fetchPlatforms,
     fetchOverview,
+    fetchHealth,
     fetchMonthlyMetrics,
+    fetchTrends,
+    fetchCategoryBreakdown,
     initializeData
   }
 })